@@ -1,10 +1,10 @@
 """Utilities extending the driver for methods provided with RsInstrument."""
 
-from typing import List, Tuple
+from typing import List, Tuple, Callable
 import threading
 
 from ..Internal import Core
-from ..Internal.ContextManagers import InstrErrorSuppressor, VisaTimeoutSuppressor
+from ..Internal.ContextManagers import InstrErrorSuppressor, VisaTimeoutSuppressor, WriteBatch
 from ..Internal import Conversions as Conv
 from ..Internal.ScpiLogger import ScpiLogger
 
@@ -228,6 +228,11 @@ class Utilities:
 		Writes the command to the instrument as string."""
 		self._core.io.write(cmd)
 
+	def write_many(self, cmds: List[str]) -> None:
+		"""Writes the commands to the instrument one after another.
+		The instrument status is only checked once, after the last command."""
+		self._core.io.write_many(cmds)
+
 	def write_int(self, cmd: str, param: int) -> None:
 		"""Writes the command to the instrument followed by the integer parameter:
 		e.g.: cmd = 'SELECT:INPUT' param = '2', result command = 'SELECT:INPUT 2'"""
@@ -413,6 +418,13 @@ class Utilities:
 		Throws an exception if the returned data was not a binary data."""
 		self._core.io.query_bin_block_to_file_with_opc(query, file_path, append, timeout)
 
+	def query_bin_float_list_in_chunks(self, query: str, handler: Callable, chunk_samples: int = 65536) -> None:
+		"""Queries binary data block of float numbers and sends them to the handler in lists of chunk_samples numbers, as the data arrive.
+		The last list can be shorter. Use it for very large traces: unlike the query_bin_or_ascii_float_list(), the whole response is never held in memory.
+		The numbers are decoded with the current bin_float_numbers_format.
+		Handler prototype: handler(numbers: List[float])"""
+		self._core.io.query_bin_float_list_in_chunks(query, handler, chunk_samples)
+
 	def write_bin_block_from_file(self, cmd: str, file_path: str) -> None:
 		"""Writes data from the file as binary data block to the instrument using the provided command.
 		Example for transferring a file from PC -> Instrument:
@@ -478,6 +490,13 @@ class Utilities:
 		"""
 		return VisaTimeoutSuppressor(self._core.io, visa_tout_ms)
 
+	def write_batch(self, max_size: int = 16384) -> WriteBatch:
+		"""Returns Context Manager that collects the set commands entered with its write() method.
+		On leaving the context, the commands are sent joined with ';' to compound commands of maximum max_size characters,
+		and the instrument status is checked only once. Use it for long sequences of short set commands.
+		:param max_size: Maximum length of one compound command. Default value: 16384 characters."""
+		return WriteBatch(self._core.io, max_size)
+
 	def sync_from(self, source: 'Utilities') -> None:
 		"""Synchronises these Utils with the source."""
 		self.logger.sync_from(source.logger)
@@ -1,7 +1,7 @@
 """Context managers for common SCPI tasks."""
 
 from .Instrument import Instrument
-from .InstrumentErrors import assert_no_instrument_status_errors, TimeoutException, StatusException
+from .InstrumentErrors import assert_no_instrument_status_errors, assert_cmd_has_no_qmark, TimeoutException, StatusException
 from typing import List, Tuple
 from pyvisa import VisaIOError
 
@@ -154,3 +154,59 @@ class VisaTimeoutSuppressor:
 	def get_timeout_occurred(self) -> bool:
 		"""Returns True, if the VISA timeout occurred in the context."""
 		return self._timeout_occurred
+
+
+class WriteBatch:
+	"""Context-manager class to send many short set commands with fewer VISA transfers.
+	The commands entered with write() are joined with ';' to compound commands.
+	Each command except the first one in a compound command gets the root prefix ':',
+	so it is not interpreted relative to the previous command's header.
+	On leaving the context, the compound commands are sent, and the instrument status is checked once.
+	:param io: RsInstrument session instance.
+	:param max_size: Maximum length of one compound command. Default value: 16384 characters."""
+
+	def __init__(self, io: Instrument, max_size: int = 16384):
+		self._io: Instrument = io
+		self._max_size: int = max_size
+		self._compounds: List[str] = []
+		self._current: List[str] = []
+		self._current_len: int = 0
+
+	def __enter__(self) -> 'WriteBatch':
+		"""Stuff to do when entering the context.
+		Currently, do not do anything."""
+		return self
+
+	def __exit__(self, exc_type, value, traceback):
+		"""Stuff to do when leaving the context:
+		- Sends all the batched commands, if no exception occurred in the context."""
+		if exc_type is None:
+			self.flush()
+		return False
+
+	def write(self, cmd: str) -> None:
+		"""Adds the set command to the batch. Queries are not allowed."""
+		cmd = cmd.strip()
+		assert_cmd_has_no_qmark(cmd, 'WriteBatch')
+		if self._current:
+			if not cmd.startswith((':', '*')):
+				cmd = ':' + cmd
+			if self._current_len + len(cmd) + 1 > self._max_size:
+				self._end_compound()
+		self._current.append(cmd)
+		self._current_len += len(cmd) + 1
+
+	def _end_compound(self) -> None:
+		"""Moves the current commands as one compound command to the list of compound commands."""
+		self._compounds.append(';'.join(self._current))
+		self._current = []
+		self._current_len = 0
+
+	def flush(self) -> None:
+		"""Sends all the batched commands, and checks the instrument status."""
+		if self._current:
+			self._end_compound()
+		if self._compounds:
+			compounds = self._compounds
+			self._compounds = []
+			self._io.write_many(compounds, log_info='Write batch')
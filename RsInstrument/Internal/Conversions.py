@@ -1,6 +1,7 @@
 """Contains conversion functions for SCPI string -> parameter and vice versa."""
 
 import math
+from array import array
 import struct
 import sys
 from enum import Enum
@@ -49,52 +50,95 @@ def _get_endianness_symbol(swap_endianness: bool) -> str:
 		return '<'
 
 
+def _bytes_to_number_list(data: bytes, typecode: str, swap_endianness: bool) -> List:
+	"""Converts bytes to list of numbers of the entered array typecode.
+	Unlike struct.unpack(), the array does not need the intermediate tuple of all the numbers."""
+	numbers = array(typecode)
+	numbers.frombytes(data)
+	if swap_endianness:
+		numbers.byteswap()
+	return numbers.tolist()
+
+
 def bytes_to_float32_list(data: bytes, swap_endianness=False) -> List[float]:
 	"""Converts bytes to list of floats - one number is represented by 4 bytes."""
-	fmt = f'{_get_endianness_symbol(swap_endianness)}{len(data) // 4}f'
-	return list(struct.unpack(fmt, data))
+	return _bytes_to_number_list(data, 'f', swap_endianness)
 
 
 def bytes_to_double64_list(data: bytes, swap_endianness=False) -> List[float]:
 	"""Converts bytes to list of doubles - one number is represented by 8 bytes."""
-	fmt = f'{_get_endianness_symbol(swap_endianness)}{len(data) // 8}d'
-	return list(struct.unpack(fmt, data))
+	return _bytes_to_number_list(data, 'd', swap_endianness)
 
 
 def bytes_to_int32_list(data: bytes, swap_endianness=False) -> List[int]:
 	"""Converts bytes to list of integer32 - one number is represented by 4 bytes."""
-	fmt = f'{_get_endianness_symbol(swap_endianness)}{len(data) // 4}i'
-	return list(struct.unpack(fmt, data))
+	return _bytes_to_number_list(data, 'i', swap_endianness)
 
 
 def bytes_to_int16_list(data: bytes, swap_endianness=False) -> List[int]:
 	"""Converts bytes to list of integer16 - one number is represented by 2 bytes."""
-	fmt = f'{_get_endianness_symbol(swap_endianness)}{len(data) // 2}h'
-	return list(struct.unpack(fmt, data))
+	return _bytes_to_number_list(data, 'h', swap_endianness)
+
+
+# Array typecode and endianness swapping of the binary number formats
+_bin_float_typecodes = {
+	BinFloatFormat.Single_4bytes: ('f', False),
+	BinFloatFormat.Single_4bytes_swapped: ('f', True),
+	BinFloatFormat.Double_8bytes: ('d', False),
+	BinFloatFormat.Double_8bytes_swapped: ('d', True)}
+_bin_int_typecodes = {
+	BinIntFormat.Integer32_4bytes: ('i', False),
+	BinIntFormat.Integer32_4bytes_swapped: ('i', True),
+	BinIntFormat.Integer16_2bytes: ('h', False),
+	BinIntFormat.Integer16_2bytes_swapped: ('h', True)}
 
 
 def bytes_to_list_of_floats(data: bytes, fmt: BinFloatFormat) -> List[float]:
 	"""Decodes binary data to a list of floating-point numbers based on the entered format."""
-	if fmt == BinFloatFormat.Single_4bytes:
-		return bytes_to_float32_list(data)
-	elif fmt == BinFloatFormat.Single_4bytes_swapped:
-		return bytes_to_float32_list(data, True)
-	elif fmt == BinFloatFormat.Double_8bytes:
-		return bytes_to_double64_list(data)
-	elif fmt == BinFloatFormat.Double_8bytes_swapped:
-		return bytes_to_double64_list(data, True)
+	typecode, swap_endianness = _bin_float_typecodes[fmt]
+	return _bytes_to_number_list(data, typecode, swap_endianness)
 
 
 def bytes_to_list_of_integers(data: bytes, fmt: BinIntFormat) -> List[int]:
 	"""Decodes binary data to a list of integer numbers based on the entered format."""
-	if fmt == BinIntFormat.Integer32_4bytes:
-		return bytes_to_int32_list(data)
-	elif fmt == BinIntFormat.Integer32_4bytes_swapped:
-		return bytes_to_int32_list(data, True)
-	elif fmt == BinIntFormat.Integer16_2bytes:
-		return bytes_to_int16_list(data)
-	elif fmt == BinIntFormat.Integer16_2bytes_swapped:
-		return bytes_to_int16_list(data, True)
+	typecode, swap_endianness = _bin_int_typecodes[fmt]
+	return _bytes_to_number_list(data, typecode, swap_endianness)
+
+
+class BinFloatListDecoder:
+	"""Decodes binary float numbers arriving in data chunks of any size.
+	The numbers are sent to the handler in lists of chunk_samples numbers, the last list can be shorter.
+	Handler prototype: handler(numbers: List[float])"""
+
+	def __init__(self, fmt: BinFloatFormat, chunk_samples: int, handler) -> None:
+		if chunk_samples < 1:
+			raise RsInstrException(f'BinFloatListDecoder chunk_samples must be at least 1, actual value: {chunk_samples}')
+		self._typecode, self._swap_endianness = _bin_float_typecodes[fmt]
+		self._number_size = array(self._typecode).itemsize
+		self._block_size = self._number_size * chunk_samples
+		self._handler = handler
+		self._buffer = bytearray()
+
+	def write(self, data: bytes) -> None:
+		"""Adds the data chunk. All the complete lists are decoded and sent to the handler."""
+		buffer = self._buffer
+		buffer += data
+		block_size = self._block_size
+		end = len(buffer) - len(buffer) % block_size
+		if end == 0:
+			return
+		for start in range(0, end, block_size):
+			self._handler(_bytes_to_number_list(buffer[start:start + block_size], self._typecode, self._swap_endianness))
+		del buffer[:end]
+
+	def flush(self) -> None:
+		"""Decodes the remaining numbers and sends them to the handler."""
+		buffer = self._buffer
+		if len(buffer) % self._number_size != 0:
+			raise RsInstrException(f'Binary float data length is not a multiple of {self._number_size} bytes, {len(buffer) % self._number_size} bytes remain.')
+		if buffer:
+			self._handler(_bytes_to_number_list(buffer, self._typecode, self._swap_endianness))
+			buffer.clear()
 
 
 def double64_list_to_bytes(data: List[float], swap_endianness=False) -> bytes:
@@ -149,6 +193,8 @@ pure_bool_true_lookup = frozenset(['on', 'On', 'ON', 'true', 'True', 'TRUE'])
 bool_true_lookup = frozenset(['1', 'on', 'On', 'ON', 'true', 'True', 'TRUE'])
 bool_false_lookup = frozenset(['0', 'off', 'Off', 'OFF', 'false', 'False', 'FALSE'])
 pure_bool_false_lookup = frozenset(['off', 'Off', 'OFF', 'false', 'False', 'FALSE'])
+# Boolean values of the exact bool_true_lookup / bool_false_lookup strings, used by the lists conversions
+_bool_values = {**dict.fromkeys(bool_true_lookup, True), **dict.fromkeys(bool_false_lookup, False)}
 
 
 def str_to_bool(string: str) -> bool:
@@ -505,8 +551,13 @@ def str_to_float_list(string: str) -> List[float]:
 		return []
 	if string.isspace():
 		return []
-	result = [*map(str_to_float, string.split(','))]
-	return result
+	elements = string.split(',')
+	try:
+		# Fast path for plain numbers. Whatever float() accepts, the str_to_float() converts to the same value
+		return [*map(float, elements)]
+	except ValueError:
+		pass
+	return [*map(str_to_float, elements)]
 
 
 def str_to_float_or_bool_list(string: str) -> List[float or bool]:
@@ -553,20 +604,45 @@ def str_to_bool_list(string: str) -> List[bool]:
 		return []
 	if string.isspace():
 		return []
-	result = [*map(str_to_bool, string.split(','))]
+	elements = string.split(',')
+	# Fast path for the elements without surrounding whitespaces or quotes
+	result = [*map(_bool_values.get, elements)]
+	if None in result:
+		result = [*map(str_to_bool, elements)]
 	return result
 
 
+def _split_outside_quotes(string: str) -> List[str]:
+	"""Splits the string by the commas that are not inside the double-quoted parts.
+	The quotes are kept, the string must contain an even number of them."""
+	elements = ['']
+	# The odd parts are inside the quotes
+	for i, part in enumerate(string.split('"')):
+		if i % 2:
+			elements[-1] += '"' + part + '"'
+		else:
+			first, *rest = part.split(',')
+			elements[-1] += first
+			elements.extend(rest)
+	return elements
+
+
 def str_to_str_list(string: str, remove_blank_response: bool = False) -> List[str]:
 	"""Converts string with comma-separated values to list of strings.
-	Each element is trimmed by trim_str_response().
+	Commas inside the double-quoted elements do not split them. Each element is trimmed by trim_str_response().
 	Meaning of the 'remove_empty_response':
 		- False(default): empty response is returned as a list with one empty element [''].
 		- True: empty response is returned as an empty list []."""
 	assert_string_data(string)
 	if not string:
 		return []
-	result = [*map(Utilities.trim_str_response, string.split(','))]
+	if '"' in string and string.count('"') % 2 == 0:
+		result = [*map(Utilities.trim_str_response, _split_outside_quotes(string))]
+	elif "'" in string or '"' in string:
+		result = [*map(Utilities.trim_str_response, string.split(','))]
+	else:
+		# Without any quotes, the trim_str_response() only strips the whitespaces
+		result = [x.strip() for x in string.split(',')]
 	if remove_blank_response and len(result) == 1 and result[0] == '':
 		return []
 	return result
@@ -1,6 +1,7 @@
 """See the class docstring."""
 
 from enum import Enum
+from functools import partial
 
 from .Conversions import str_to_bool, str_to_int, str_to_int_or_bool, str_to_float, str_to_float_or_bool, str_to_scalar_enum_helper
 from .Conversions import str_to_str_list, str_to_bool_list, str_to_int_list, str_to_int_or_bool_list, str_to_float_list, str_to_float_or_bool_list, str_to_list_enum_helper
@@ -9,6 +10,21 @@ from .Utilities import trim_str_response
 from .InstrumentErrors import RsInstrException
 from .ScpiEnums import ScpiEnum
 
+# Integer tags of the enum element data types, resolved once at import
+_TAG_ENUM = DataType.Enum.value
+_TAG_ENUM_EXT = DataType.EnumExt.value
+
+# Element data type tag -> (scalar converter, list converter). Enum types have their converters bound per instance
+_FROM_SCPI = {
+	DataType.RawString.value: (trim_str_response, str_to_str_list),
+	DataType.String.value: (trim_str_response, str_to_str_list),
+	DataType.Boolean.value: (str_to_bool, str_to_bool_list),
+	DataType.Integer.value: (str_to_int, str_to_int_list),
+	DataType.IntegerExt.value: (str_to_int_or_bool, str_to_int_or_bool_list),
+	DataType.Float.value: (str_to_float, str_to_float_list),
+	DataType.FloatExt.value: (str_to_float_or_bool, str_to_float_or_bool_list),
+}
+
 
 class ConverterFromScpiString:
 	"""Converter from SCPI response string to argument value
@@ -19,60 +35,37 @@ class ConverterFromScpiString:
 	- get_value(str): calls either get_one_element_value or get_list_value() depending on the data type. \n
 	The reason for the different methods is, that sometimes the list data are interleaved with other arguments.
 	In order to parse them properly, the ArgStructStringParser module must be able to set the argument value element-by-element.
-	The driver methods might want to set the whole argument value, because the result scpi string is a single argument response."""
+	The driver methods might want to set the whole argument value, because the result scpi string is a single argument response.
+	The get_one_element_value is not a method, but the converter function assigned in the constructor."""
+	__slots__ = ('scpi_enum', 'data_type', 'element_type', 'converter', 'list_converter', 'get_one_element_value', '_is_list')
 
 	def __init__(self, data_type: DataType, enum_type: Enum = None):
 		self.scpi_enum = None
 		self.data_type = data_type
 		self.element_type = self.data_type.element_type
+		self._is_list = self.data_type.is_list
+		tag = self.element_type.value
 
-		if self.element_type == DataType.RawString:
-			self.converter = trim_str_response
-			self.list_converter = str_to_str_list
-
-		elif self.element_type == DataType.String:
-			self.converter = trim_str_response
-			self.list_converter = str_to_str_list
-
-		elif self.element_type == DataType.Boolean:
-			self.converter = str_to_bool
-			self.list_converter = str_to_bool_list
-
-		elif self.element_type == DataType.Integer:
-			self.converter = str_to_int
-			self.list_converter = str_to_int_list
-
-		elif self.element_type == DataType.IntegerExt:
-			self.converter = str_to_int_or_bool
-			self.list_converter = str_to_int_or_bool_list
-
-		elif self.element_type == DataType.Float:
-			self.converter = str_to_float
-			self.list_converter = str_to_float_list
-
-		elif self.element_type == DataType.FloatExt:
-			self.converter = str_to_float_or_bool
-			self.list_converter = str_to_float_or_bool_list
-
-		elif self.element_type.is_scalar_enum:
+		converters = _FROM_SCPI.get(tag)
+		if converters is not None:
+			self.converter, self.list_converter = converters
+		elif tag == _TAG_ENUM or tag == _TAG_ENUM_EXT:
 			assert enum_type, f"For data type enum, you have to define the enum_type variable."
 			# noinspection PyTypeChecker
 			self.scpi_enum = ScpiEnum(enum_type)
+			# EnumExt tolerates values not found in the enum, and returns them as strings
+			exc_if_not_found = tag == _TAG_ENUM
+			self.converter = partial(str_to_scalar_enum_helper, scpi_enum=self.scpi_enum, array_search=False, exc_if_not_found=exc_if_not_found)
+			self.list_converter = partial(str_to_list_enum_helper, scpi_enum=self.scpi_enum, exc_if_not_found=exc_if_not_found)
 		else:
 			raise RsInstrException(f"Unsupported data type '{data_type}'")
 
-	def get_one_element_value(self, scpi_string: str):
-		"""Returns single element (not an array!!!) of the argument value converted from the SCPI string (single element)"""
-		assert isinstance(scpi_string, str), f"Input parameter scpi_string must be string. Actual parameter: {type(scpi_string)}, value: {scpi_string}"
-		if self.element_type.is_scalar_enum:
-			return str_to_scalar_enum_helper(scpi_string, self.scpi_enum, False, exc_if_not_found=self.element_type == DataType.Enum)
-		return self.converter(scpi_string)
+		# Returns single element (not an array!!!) of the argument value converted from the SCPI string (single element)
+		self.get_one_element_value = self.converter
 
 	def get_value(self, scpi_string: str):
 		"""Returns complete value of the argument converted from the SCPI string (list or scalar)"""
-		if not self.data_type.is_list:
+		if not self._is_list:
 			return self.get_one_element_value(scpi_string)
-		assert isinstance(scpi_string, str), f"Input parameter scpi_string must be string. Actual parameter: {type(scpi_string)}, value: {scpi_string}"
-		if self.element_type is DataType.Enum:
-			return str_to_list_enum_helper(scpi_string, self.scpi_enum, exc_if_not_found=self.element_type == DataType.Enum)
+		# The list converters check the input type themselves
 		return self.list_converter(scpi_string)
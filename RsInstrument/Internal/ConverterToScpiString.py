@@ -1,59 +1,115 @@
 """See the class docstring."""
 
 from enum import Enum
+from functools import partial
 
 from .Conversions import list_to_csv_quoted_str, value_to_quoted_str, list_to_csv_str, value_to_str, enum_list_to_str, enum_scalar_to_str, enum_ext_scalar_to_str, enum_ext_list_to_str
 from .Types import DataType
 from .InstrumentErrors import RsInstrException
 
+# SCPI representation of the boolean list elements
+_BOOL_REPR = {True: 'ON', False: 'OFF'}
 
-def value_to_scpi_string(data, data_type: DataType) -> str:
-	"""Convert data to SCPI string parameter: data -> str.
-	Does not work with enum data types."""
-	if data_type.is_list:
+# Allowed element types of the number arguments, for the isinstance() checks
+_NUMBER_TYPES = (int, float)
+_NUMBER_EXT_TYPES = (int, float, bool)
+
+
+# Strings are enclosed by single quotes
+def _string_list_to_scpi(data) -> str:
+	assert all(isinstance(x, str) for x in data), f"Expected command parameter list of strings, detected one or more elements of non-string type. Value: {data}"
+	return list_to_csv_quoted_str(data)
+
+
+def _string_to_scpi(data) -> str:
+	assert isinstance(data, str), f"Expected command parameter string, actual data type: {type(data)}. Value: {data}"
+	return value_to_quoted_str(data)
+
+
+# Raw string is not enclosed by quotes
+def _raw_string_list_to_scpi(data) -> str:
+	assert all(isinstance(x, str) for x in data), f"Expected command parameter list of strings, detected one or more elements of non-string type. Value: {data}"
+	return list_to_csv_str(data)
+
+
+def _raw_string_to_scpi(data) -> str:
+	assert isinstance(data, str), f"Expected command parameter string, actual data type: {type(data)}. Value: {data}"
+	return value_to_str(data)
+
+
+def _boolean_list_to_scpi(data) -> str:
+	assert all(type(x) is bool for x in data), f"Expected command parameter list of booleans, detected one or more elements of non-boolean type. Value: {data}"
+	return ','.join([_BOOL_REPR[x] for x in data])
+
+
+def _boolean_to_scpi(data) -> str:
+	assert type(data) is bool, f"Expected command parameter boolean, actual data type: {type(data)}. Value: {data}"
+	return value_to_str(data)
+
+
+# For integer and float, allow them to be mixed
+def _number_list_to_scpi(data) -> str:
+	assert all(isinstance(x, _NUMBER_TYPES) and type(x) is not bool for x in data), f"Expected command parameter list of numbers, detected one or more elements of non-number type. Value: {data}"
+	return ','.join(map(value_to_str, data))
+
+
+def _number_to_scpi(data) -> str:
+	assert isinstance(data, _NUMBER_TYPES) and type(data) is not bool, f"Expected command parameter number, actual data type: {type(data)}. Value: {data}"
+	return value_to_str(data)
+
+
+# For integer and float extended, allow them to be mixed including the boolean type
+def _number_ext_list_to_scpi(data) -> str:
+	assert all(isinstance(x, _NUMBER_EXT_TYPES) for x in data), f"Expected command parameter list of numbers or booleans, detected one or more elements of non-number type. Value: {data}"
+	return ','.join(map(value_to_str, data))
+
+
+def _number_ext_to_scpi(data) -> str:
+	assert isinstance(data, _NUMBER_EXT_TYPES), f"Expected command parameter number or boolean, actual data type: {type(data)}. Value: {data}"
+	return value_to_str(data)
+
+
+# Data type tag -> serializer of the argument value. Enum types have their serializers bound per instance
+_TO_SCPI = {
+	DataType.StringList.value: _string_list_to_scpi,
+	DataType.String.value: _string_to_scpi,
+	DataType.RawStringList.value: _raw_string_list_to_scpi,
+	DataType.RawString.value: _raw_string_to_scpi,
+	DataType.BooleanList.value: _boolean_list_to_scpi,
+	DataType.Boolean.value: _boolean_to_scpi,
+	DataType.IntegerList.value: _number_list_to_scpi,
+	DataType.FloatList.value: _number_list_to_scpi,
+	DataType.Integer.value: _number_to_scpi,
+	DataType.Float.value: _number_to_scpi,
+	DataType.IntegerExtList.value: _number_ext_list_to_scpi,
+	DataType.FloatExtList.value: _number_ext_list_to_scpi,
+	DataType.IntegerExt.value: _number_ext_to_scpi,
+	DataType.FloatExt.value: _number_ext_to_scpi,
+}
+
+_ENUM_TO_SCPI = {
+	DataType.Enum.value: enum_scalar_to_str,
+	DataType.EnumExt.value: enum_ext_scalar_to_str,
+	DataType.EnumList.value: enum_list_to_str,
+	DataType.EnumExtList.value: enum_ext_list_to_str,
+}
+
+
+def _assert_list_or_scalar(data, is_list: bool) -> None:
+	if is_list:
 		assert isinstance(data, list), f"Expected command parameter list, actual data type: {type(data)}. Value: {data}"
 	else:
 		assert not isinstance(data, list), f"Expected command parameter scalar, actual data type: {type(data)}. Value: {data}"
-	# Strings are enclosed by single quotes
-	if data_type == DataType.StringList:
-		assert all(isinstance(x, str) for x in data), f"Expected command parameter list of strings, detected one or more elements of non-string type. Value: {data}"
-		return list_to_csv_quoted_str(data)
-	elif data_type == DataType.String:
-		assert isinstance(data, str), f"Expected command parameter string, actual data type: {type(data)}. Value: {data}"
-		return value_to_quoted_str(data)
-
-	# Raw string is not enclosed by quotes
-	elif data_type == DataType.RawStringList:
-		assert all(isinstance(x, str) for x in data), f"Expected command parameter list of strings, detected one or more elements of non-string type. Value: {data}"
-		return list_to_csv_str(data)
-	elif data_type == DataType.RawString:
-		assert isinstance(data, str), f"Expected command parameter string, actual data type: {type(data)}. Value: {data}"
-		return value_to_str(data)
-
-	elif data_type == DataType.BooleanList:
-		assert all(type(x) == bool for x in data), f"Expected command parameter list of booleans, detected one or more elements of non-boolean type. Value: {data}"
-		return list_to_csv_str(data)
-	elif data_type == DataType.Boolean:
-		assert type(data) == bool, f"Expected command parameter boolean, actual data type: {type(data)}. Value: {data}"
-		return value_to_str(data)
-
-	# For integer and float, allow them to be mixed
-	elif data_type == DataType.IntegerList or data_type == DataType.FloatList:
-		assert all((isinstance(x, int) or isinstance(x, float)) and type(x) != bool for x in data), f"Expected command parameter list of numbers, detected one or more elements of non-number type. Value: {data}"
-		return list_to_csv_str(data)
-	elif data_type == DataType.Integer or data_type == DataType.Float:
-		assert (isinstance(data, int) or isinstance(data, float)) and type(data) != bool, f"Expected command parameter number, actual data type: {type(data)}. Value: {data}"
-		return value_to_str(data)
-
-	# For integer and float extended, allow them to be mixed including the boolean type
-	elif data_type == DataType.IntegerExtList or data_type == DataType.FloatExtList:
-		assert all((isinstance(x, int) or isinstance(x, float) or isinstance(x, bool)) for x in data), f"Expected command parameter list of numbers or booleans, detected one or more elements of non-number type. Value: {data}"
-		return list_to_csv_str(data)
-	elif data_type == DataType.IntegerExt or data_type == DataType.FloatExt:
-		assert (isinstance(data, int) or isinstance(data, float) or isinstance(data, bool)), f"Expected command parameter number or boolean, actual data type: {type(data)}. Value: {data}"
-		return value_to_str(data)
-	else:
+
+
+def value_to_scpi_string(data, data_type: DataType) -> str:
+	"""Convert data to SCPI string parameter: data -> str.
+	Does not work with enum data types."""
+	_assert_list_or_scalar(data, data_type.is_list)
+	serializer = _TO_SCPI.get(data_type.value)
+	if serializer is None:
 		raise RsInstrException(f"Unsupported data type: '{type(data_type)}'.")
+	return serializer(data)
 
 
 class ConverterToScpiString:
@@ -61,25 +117,24 @@ class ConverterToScpiString:
 	Provides method get_value(arg_value) -> str
 	"""
 
+	__slots__ = ('enum_type', 'data_type', 'element_type', '_is_list', '_serialize')
+
 	def __init__(self, data_type: DataType, enum_type: Enum = None):
 		self.enum_type = enum_type
 		self.data_type = data_type
 		self.element_type = self.data_type.element_type
-		if self.element_type == DataType.Enum or self.element_type == DataType.EnumExt:
+		self._is_list = self.data_type.is_list
+		tag = self.data_type.value
+		enum_serializer = _ENUM_TO_SCPI.get(tag)
+		if enum_serializer is not None:
 			assert self.enum_type, f"For data_type {data_type.name}, you have to define the enum_type variable."
+			self._serialize = partial(enum_serializer, enum_type=self.enum_type)
+		else:
+			self._serialize = _TO_SCPI.get(tag)
+			if self._serialize is None:
+				raise RsInstrException(f"Unsupported data type: '{type(data_type)}'.")
 
 	def get_value(self, data) -> str:
 		"""Returns SCPI string converted from the argument data."""
-		if self.data_type.is_list:
-			assert isinstance(data, list), f"Expected command parameter list, actual data type: {type(data)}. Value: {data}"
-		else:
-			assert not isinstance(data, list), f"Expected command parameter scalar, actual data type: {type(data)}. Value: {data}"
-		if self.data_type == DataType.Enum:
-			return enum_scalar_to_str(data, self.enum_type)
-		if self.data_type == DataType.EnumExt:
-			return enum_ext_scalar_to_str(data, self.enum_type)
-		if self.data_type == DataType.EnumList:
-			return enum_list_to_str(data, self.enum_type)
-		if self.data_type == DataType.EnumExtList:
-			return enum_ext_list_to_str(data, self.enum_type)
-		return value_to_scpi_string(data, self.data_type)
+		_assert_list_or_scalar(data, self._is_list)
+		return self._serialize(data)
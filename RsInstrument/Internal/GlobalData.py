@@ -17,23 +17,21 @@ class GlobalData:
     @classmethod
     def set_logging_target(cls, value: datetime or None) -> None:
         """Sets the class variable to the entered value."""
-        setattr(cls.bounded_class, '_global_logging_target_stream', value)
+        cls.bounded_class._global_logging_target_stream = value
 
     @classmethod
     def get_logging_target(cls):
         """Returns the class variable value."""
-        if not cls.is_bounded():
-            return None
-        return getattr(cls.bounded_class, '_global_logging_target_stream')
+        bounded_class = cls.bounded_class
+        return bounded_class._global_logging_target_stream if bounded_class is not None else None
 
     @classmethod
     def set_logging_relative_timestamp(cls, value: datetime or None) -> None:
         """Sets the class variable to the entered value."""
-        setattr(cls.bounded_class, '_global_logging_relative_timestamp', value)
+        cls.bounded_class._global_logging_relative_timestamp = value
 
     @classmethod
     def get_logging_relative_timestamp(cls) -> datetime or None:
         """Returns the class variable value."""
-        if not cls.is_bounded():
-            return None
-        return getattr(cls.bounded_class, '_global_logging_relative_timestamp')
+        bounded_class = cls.bounded_class
+        return bounded_class._global_logging_relative_timestamp if bounded_class is not None else None
@@ -2,7 +2,9 @@
 
 import re
 import threading
+import time
 from enum import Enum
+from functools import lru_cache
 from typing import Callable, Dict, AnyStr
 from datetime import datetime, timedelta
 from pyvisa import VisaIOError
@@ -21,6 +23,23 @@ from .RepeatedCapability import RepeatedCapability
 from .ScpiLogger import ScpiLogger
 from .InstrumentErrors import *
 
+# Default values of the *IDN? fields: Manufacturer, Model, SerialNumber, FirmwareRevision
+_IDN_DEFAULTS = ("Rohde&Schwarz", "RsInstrument1000", "100000", "1.0.0")
+# Log string suffix of the sessions initialized from a direct session
+_DIRECT_SESSION_LOG_STR = ' from direct session'
+# Self-test response: code and the optional message
+_TST_RE = re.compile(r'(-?\d+)(?:,(.*))?')
+# Maximum number of cached command splits for the global repcaps replacement
+_GLOBAL_REPCAPS_TEMPLATES_MAX = 1024
+# Short model name from the full model name, e.g. 'SMW' from 'SMW200A'
+_IDN_MODEL_RE = re.compile(r'([a-zA-Z ]+)([\-\da-zA-Z ]*)')
+
+
+@lru_cache(maxsize=64)
+def _compile_idn_pattern(pattern: str):
+	"""Returns the compiled case-insensitive supported *IDN? pattern. The patterns are the same for all the sessions of a driver."""
+	return re.compile(pattern, re.IGNORECASE)
+
 
 class Instrument(object):
 	"""Model of an instrument with VISA interface."""
@@ -34,19 +53,28 @@ class Instrument(object):
 		self.logger: ScpiLogger or None = None
 		self._last_exc_log: str or None = None
 		self._start_time: datetime or None = None
+		# Monotonic start time of the self._start_time in nanoseconds, used for the duration statistics
+		self._start_ns: int = 0
 		self.__session = None
 		self._global_repcaps: Dict[str, RepeatedCapability] = {}
+		# Alternation of all the global repcap names, None if no global repcaps are defined
+		self._global_repcaps_pattern = None
+		# Commands split by the self._global_repcaps_pattern, see the _replace_global_repcaps()
+		self._global_repcaps_templates: Dict[str, tuple] = {}
 		self._linker = InternalLinker()
 		# noinspection PyTypeChecker
 		self.on_write_handler: Callable = None
 		# noinspection PyTypeChecker
 		self.on_read_handler: Callable = None
+		# Arguments of the currently running chunk transfer events, see the start_send_read_event() and start_send_write_bin_event()
+		self._read_event_args: IoTransferEventArgs or None = None
+		self._write_event_args: IoTransferEventArgs or None = None
 		self._io_events_include_data: bool = False
 		self._lock = None
 		self._before_query_handler = None
 		self._before_write_handler = None
-		# noinspection PyTypeChecker
-		self.total_execution_time: timedelta = None
+		# Accumulated execution time in nanoseconds, see the total_execution_time property
+		self._total_execution_ns: int = 0
 		# noinspection PyTypeChecker
 		self.total_time_startpoint: datetime = None
 		self.reset_time_statistics()
@@ -72,7 +100,7 @@ class Instrument(object):
 
 		direct_start_time = datetime.now()
 		try:
-			dir_str = ' from direct session' if self._direct_session else ''
+			dir_str = _DIRECT_SESSION_LOG_STR if self._direct_session else ''
 			if self._simulating:
 				# noinspection PyTypeChecker
 				self._set_session(VisaSessionSim(resource_name, self._settings, direct_session))
@@ -183,6 +211,11 @@ class Instrument(object):
 		"""Returns true, if the reconnection is supported - the session is unique, and not reused."""
 		return not self._direct_session
 
+	@property
+	def total_execution_time(self) -> timedelta:
+		"""Returns the accumulated execution time of all the write / query operations."""
+		return timedelta(microseconds=self._total_execution_ns // 1000)
+
 	def reconnect(self, force_close: bool = False) -> bool:
 		"""If the connection is not active, the method tries to reconnect to the device
 		If the connection is active, and force_close is False, the method does nothing.
@@ -190,7 +223,7 @@ class Instrument(object):
 		Returns True, if the reconnection has been performed."""
 		if not self.allow_reconnect:
 			raise RsInstrException('Reused sessions do not support reconnection')
-		self._start_time = datetime.now()
+		self._set_start_time()
 		active = self.is_connection_active()
 		log_info = 'Forced Reconnection' if force_close else 'Reconnection'
 		if force_close and active:
@@ -203,7 +236,7 @@ class Instrument(object):
 		if not active:
 			# Connect again
 			try:
-				dir_str = ' from direct session' if self._direct_session else ''
+				dir_str = _DIRECT_SESSION_LOG_STR if self._direct_session else ''
 				sim = ' simulation' if self._direct_session else ''
 				init_method = VisaSessionSim if self._simulating else VisaSession
 
@@ -261,33 +294,49 @@ class Instrument(object):
 		"""Unlocks the instrument to other clients."""
 		self._session.unlock_resource()
 
-	def _log_start_segment(self, direct_start_time: datetime = None):
-		"""Sets start time for the log entry to be able to calculate the duration. You can enter a direct start time."""
-		self._last_error_log = None
+	def _set_start_time(self, direct_start_time: datetime = None) -> None:
+		"""Sets the start time of the current operation, by default to now."""
 		if direct_start_time:
 			self._start_time = direct_start_time
+			self._start_ns = time.monotonic_ns() - int((datetime.now() - direct_start_time).total_seconds() * 1E9)
 		else:
 			self._start_time = datetime.now()
-		self.logger.start_new_segment()
+			self._start_ns = time.monotonic_ns()
+
+	def _log_start_segment(self, direct_start_time: datetime = None):
+		"""Sets start time for the log entry to be able to calculate the duration. You can enter a direct start time."""
+		self._last_error_log = None
+		self._set_start_time(direct_start_time)
+		# With the logging off, the logger has no segment to start or end
+		if self.logger.enabled:
+			self.logger.start_new_segment()
 
 	def _log_info(self, log_string_info: str, log_string: str, cmd: str or None) -> None:
 		"""Logs an ASCII entry."""
 		self._last_exc_log = None
+		if not self.logger.enabled:
+			return
 		self.logger.info(self._start_time, datetime.now(), log_string_info, log_string, cmd)
 
 	def _log_info_list(self, log_string_info: str, list_data: List, cmd: str or None) -> None:
 		"""Logs a List entry."""
 		self._last_exc_log = None
+		if not self.logger.enabled:
+			return
 		self.logger.info_list(self._start_time, datetime.now(), log_string_info, list_data, cmd)
 
 	def _log_info_bin(self, log_string_info: str, log_data: bytes, cmd: str or None) -> None:
 		"""Logs a binary entry."""
 		self._last_exc_log = None
+		if not self.logger.enabled:
+			return
 		self.logger.info_bin(self._start_time, datetime.now(), log_string_info, log_data, cmd)
 
 	def _log_info_var_stream(self, log_string_info: str, binary: bool, content: AnyStr, cmd: str or None) -> None:
 		"""Logs a stream entry - must be variable only, but can be binary or ascii."""
 		self._last_exc_log = None
+		if not self.logger.enabled:
+			return
 		if binary:
 			self.logger.info_bin(self._start_time, datetime.now(), log_string_info, content, cmd)
 		else:
@@ -320,15 +369,15 @@ class Instrument(object):
 		"""Ends logging segment."""
 
 		if self._start_time:
-			# Accumulate the spent times
-			end_time = datetime.now()
-			if end_time >= self._start_time:
-				diff = end_time - self._start_time
-				self.total_execution_time += diff
+			# Accumulate the spent times, the monotonic clock is not affected by the system time changes
+			diff_ns = time.monotonic_ns() - self._start_ns
+			if diff_ns > 0:
+				self._total_execution_ns += diff_ns
 
 		self._start_time = None
 		self._last_exc_log = None
-		self.logger.end_current_segment()
+		if self.logger.enabled:
+			self.logger.end_current_segment()
 
 	@property
 	def visa_manufacturer(self) -> str:
@@ -376,9 +425,14 @@ class Instrument(object):
 	@property
 	def instr_options(self) -> InstrumentOptions:
 		"""Public getter for the lazy property instr_options"""
-		if self._instr_options is None:
-			self._query_options_and_parse(self.instr_options_parse_mode)
-		return self._instr_options
+		instr_options = self._instr_options
+		if instr_options is None:
+			with self._lock:
+				# Another thread might have queried the options while this one was waiting for the lock
+				if self._instr_options is None:
+					self._query_options_and_parse(self.instr_options_parse_mode)
+				instr_options = self._instr_options
+		return instr_options
 
 	@property
 	def opc_timeout(self) -> int:
@@ -435,43 +489,23 @@ class Instrument(object):
 		- SerialNumber
 		- FirmwareRevision"""
 		idn_string = Utilities.trim_str_response(idn_string).strip()
-		items = idn_string.split(',')
-		items_count = len(items)
-		if len(idn_string) == 0:
-			items_count = 0
-
-		self.manufacturer = "Rohde&Schwarz"
-		if items_count >= 1:
-			self.manufacturer = Utilities.trim_str_response(items[0].strip())
-
-		self.full_model_name = "RsInstrument1000"
-		if items_count >= 2:
-			self.full_model_name = Utilities.trim_str_response(items[1].strip())
+		# Only the first four fields are relevant, the missing ones get the default values
+		items = [Utilities.trim_str_response(x) for x in idn_string.split(',', 4)[:4]] if idn_string else []
+		items.extend(_IDN_DEFAULTS[len(items):])
+		self.manufacturer, self.full_model_name, self.serial_number, self.firmware_version = items
 		self.model = self.full_model_name
 		if self._settings.idn_model_full_name is False:
-			m = re.search(r'([a-zA-Z ]+)([\-\da-zA-Z ]*)', self.full_model_name)
+			m = _IDN_MODEL_RE.search(self.full_model_name)
 			if m:
 				self.model = m.group(1)
 
-		self.serial_number = "100000"
-		if items_count >= 3:
-			self.serial_number = Utilities.trim_str_response(items[2].strip())
-
-		self.firmware_version = "1.0.0"
-		if items_count >= 4:
-			self.firmware_version = Utilities.trim_str_response(items[3].strip())
-
 	def fits_idn_pattern(self, patterns: List[str], supported_models: List[str]) -> None:
 		"""Throws exception if the current instrument model does not fit  any of the patterns.
 		The supported_models argument is only used for exception messages"""
-		matches = False
 		if not self._idn_string:
 			return
-		for x in patterns:
-			matches = re.search(x, self.idn_string, re.IGNORECASE)
-			if matches:
-				break
-		if not matches:
+		idn_string = self.idn_string
+		if not any(_compile_idn_pattern(x).search(idn_string) for x in patterns):
 			message = f"Instrument is not supported.\n*IDN? string: '{self.idn_string}'"
 			if len(supported_models) > 0:
 				message += f"\nSupported models: '{', '.join(supported_models)}'"
@@ -484,7 +518,7 @@ class Instrument(object):
 	def reset_time_statistics(self) -> None:
 		"""Resets all execution and total time counters.
 		Changes the self.total_time_startpoint and resets the self.total_execution_time."""
-		self.total_execution_time = timedelta()
+		self._total_execution_ns = 0
 		self.total_time_startpoint = datetime.now()
 
 	def _query_options_and_parse(self, mode: InstrumentOptions.ParseMode) -> None:
@@ -511,29 +545,48 @@ class Instrument(object):
 	def add_global_repcap(self, name: str, rep_cap: RepeatedCapability) -> None:
 		"""Adds the global repcap name to the list of global repcaps
 		and sets its value to the provided default value."""
-		if name in self._global_repcaps:
+		if self._global_repcaps.setdefault(name, rep_cap) is not rep_cap:
 			raise RsInstrException(f"Error adding new global repcap: '{name}' already exists in the list.")
-		self._global_repcaps[name] = rep_cap
+		# Longer names first, so a name is never shadowed by another name that is its prefix
+		names = sorted(self._global_repcaps, key=len, reverse=True)
+		self._global_repcaps_pattern = re.compile('(' + '|'.join(map(re.escape, names)) + ')')
+		self._global_repcaps_templates = {}
 
 	def set_global_repcap_value(self, name: str, enum_value: Enum) -> None:
 		"""Updates the existing global repcap value as enum"""
-		if name not in self._global_repcaps:
+		rep_cap = self._global_repcaps.get(name)
+		if rep_cap is None:
 			raise RsInstrException(f"Error updating global repcap: '{name}' does not exist in the list.")
-		self._global_repcaps[name].set_enum_value(enum_value)
+		rep_cap.set_enum_value(enum_value)
 
 	def get_global_repcap_value(self, name: str) -> Enum:
 		"""Returns the current global repcap value as enum"""
-		if name not in self._global_repcaps:
+		rep_cap = self._global_repcaps.get(name)
+		if rep_cap is None:
 			raise RsInstrException(f"Error retrieving global repcap: '{name}' does not exist in the list.")
-		return self._global_repcaps[name].get_enum_value()
+		return rep_cap.get_enum_value()
 
 	def _replace_global_repcaps(self, cmd: str) -> str:
 		"""Replaces all the global repcaps in the command: e.g. '<instance>' => '1'.
 		Returns the replaced command."""
-		for name, value in self._global_repcaps.items():
-			cmd_value = value.get_cmd_string_value()
-			cmd = cmd.replace(name, cmd_value)
-		return cmd
+		pattern = self._global_repcaps_pattern
+		if pattern is None:
+			return cmd
+		templates = self._global_repcaps_templates
+		template = templates.get(cmd)
+		if template is None:
+			# Literal parts on the even indexes, repcap names on the odd indexes
+			template = tuple(pattern.split(cmd))
+			if len(templates) >= _GLOBAL_REPCAPS_TEMPLATES_MAX:
+				templates.clear()
+			templates[cmd] = template
+		if len(template) == 1:
+			return cmd
+		# Only the command split is cached, the repcap values can be changed directly in the RepeatedCapability objects
+		parts = list(template)
+		for i in range(1, len(parts), 2):
+			parts[i] = self._global_repcaps[parts[i]].get_cmd_string_value()
+		return ''.join(parts)
 
 	def query_opc(self, timeout: int = 0) -> bool:
 		"""Sends *OPC? query and returns the result.
@@ -564,29 +617,26 @@ class Instrument(object):
 			log_info = 'Query all system errors'
 			if enable_log is True:
 				if self._start_time is None:
-					self._start_time = datetime.now()
+					self._set_start_time()
 			try:
 				self.start_send_read_event('SYST:ERROR?', False)
 				errors = self._session.query_all_syst_errors()
 				self.end_send_read_event()
-				if errors is not None:
-					if include_codes:
-						entries = [f"{x[1]},'{x[0]}'" for x in errors]
-					else:
-						errors = [x[1] for x in errors]
-						entries = errors
-				# Return errors as list of strings
-				if enable_log is True:
-					if errors is None or len(errors) == 0:
+				if errors is not None and not include_codes:
+					# Return errors as list of strings, they serve as the log entries as well
+					errors = [x[1] for x in errors]
+				if enable_log is True and self.logger.enabled:
+					if not errors:
 						self._log_info(log_info, 'No errors', 'SYST:ERROR?')
-					elif len(errors) == 1:
-						self._log_info(log_info, f'1 error detected - {entries[0]}', 'SYST:ERROR?')
 					else:
-						self._log_info(log_info, f'{len(errors)} errors detected (last one on top)', 'SYST:ERROR?')
-						i = 1
-						for x in entries:
-							self._log_info(f'SYST:ERROR? {i}', x, 'SYST:ERROR?')
-							i += 1
+						# Compose the log entries only if the logging is active
+						entries = [f"{x[1]},'{x[0]}'" for x in errors] if include_codes else errors
+						if len(entries) == 1:
+							self._log_info(log_info, f'1 error detected - {entries[0]}', 'SYST:ERROR?')
+						else:
+							self._log_info(log_info, f'{len(entries)} errors detected (last one on top)', 'SYST:ERROR?')
+							for i, x in enumerate(entries, 1):
+								self._log_info(f'SYST:ERROR? {i}', x, 'SYST:ERROR?')
 			except RsInstrException as e:
 				# General errors: log the exception message
 				if enable_log is True:
@@ -606,7 +656,7 @@ class Instrument(object):
 			if not self.query_instr_status:
 				return
 			if self._start_time is None:
-				self._start_time = datetime.now()
+				self._set_start_time()
 			try:
 				call_syst_error = self._session.error_in_error_queue() if self.stb_in_error_check else True
 				if call_syst_error:
@@ -667,14 +717,16 @@ class Instrument(object):
 			self.query_str(cmd, block_callback, log_info)
 			return
 
+		cmd = self._replace_global_repcaps(cmd)
 		with self._lock:
 			try:
 				self._log_start_segment()
-				cmd = self._replace_global_repcaps(cmd)
+				# Local binding of the session property, used more than once
+				session = self._session
 				self._call_before_write_handler(cmd, block_callback)
-				self._session.write(cmd)
+				session.write(cmd)
 				if self.opc_query_after_write:
-					self._session.query_opc()
+					session.query_opc()
 				if self.on_write_handler:
 					self.send_write_str_event(cmd, False)
 				self._log_info(log_info, cmd, cmd)
@@ -685,6 +737,35 @@ class Instrument(object):
 			finally:
 				self._log_end_segment()
 
+	def write_many(self, cmds: List[str], log_info: str = 'Write') -> None:
+		"""Writes string commands to the instrument one after another.
+		The instrument status is only checked once, after the last command."""
+		if self.each_cmd_as_query:
+			with self._lock:
+				for cmd in cmds:
+					self.query_str(cmd, False, log_info)
+			return
+		cmds = [self._replace_global_repcaps(x) for x in cmds]
+		with self._lock:
+			cmd = ''
+			try:
+				self._log_start_segment()
+				session = self._session
+				for cmd in cmds:
+					self._call_before_write_handler(cmd, False)
+					session.write(cmd)
+					if self.opc_query_after_write:
+						session.query_opc()
+					if self.on_write_handler:
+						self.send_write_str_event(cmd, False)
+					self._log_info(log_info, cmd, cmd)
+				self.check_status()
+			except RsInstrException as e:
+				self._log_exception(e, cmd, log_info)
+				raise
+			finally:
+				self._log_end_segment()
+
 	def write_with_opc(self, cmd: str, timeout: int = None, block_callback: bool = False, log_info: str = 'Write with OPC') -> None:
 		"""Writes a OPC-synced command.
 		Also performs error checking if the property self.query_instr_status is set to True.
@@ -692,13 +773,14 @@ class Instrument(object):
 		if self.each_cmd_as_query:
 			self.query_str_with_opc(cmd, timeout, block_callback, log_info)
 			return
+		cmd = self._replace_global_repcaps(cmd)
 		with self._lock:
 			try:
 				self._log_start_segment()
-				cmd = self._replace_global_repcaps(cmd)
+				session = self._session
 				self._call_before_write_handler(cmd, block_callback)
-				self._session.write_with_opc(cmd, timeout)
-				self._session.query_and_clear_esr()
+				session.write_with_opc(cmd, timeout)
+				session.query_and_clear_esr()
 				if self.on_write_handler:
 					self.send_write_str_event(cmd, True)
 				self._log_info(log_info, cmd, cmd)
@@ -711,33 +793,32 @@ class Instrument(object):
 
 	def write_struct(self, cmd: str, struct: object) -> None:
 		"""Writes command to the instrument with the parameter composed of the entered structure."""
-		with self._lock:
-			worker = ArgStructList(struct)
-			param = worker.compose_cmd_string()
-			cmd += f' {param}'.rstrip()
-			self.write(cmd, log_info='Write structure')
+		# Composing the parameters does not need the lock, the write takes it
+		param = ArgStructList(struct).compose_cmd_string()
+		cmd += f' {param}'.rstrip()
+		self.write(cmd, log_info='Write structure')
 
 	def write_struct_with_opc(self, cmd: str, struct: object, timeout: int = None) -> None:
 		"""Writes OPC-synced command to the instrument with the parameter composed of the entered structure.
 		If you do not provide timeout, the method uses current opc_timeout."""
-		with self._lock:
-			worker = ArgStructList(struct)
-			param = worker.compose_cmd_string()
-			cmd += f' {param}'.rstrip()
-			self.write_with_opc(cmd, timeout, log_info='Write structure with OPC')
+		# Composing the parameters does not need the lock, the write takes it
+		param = ArgStructList(struct).compose_cmd_string()
+		cmd += f' {param}'.rstrip()
+		self.write_with_opc(cmd, timeout, log_info='Write structure with OPC')
 
 	def query_str(self, query: str, block_callback: bool = False, log_info: str = 'Query') -> str:
 		"""Sends a query and reads response from the instrument.
 		The response is trimmed of any trailing LF characters and has no length limit."""
+		query = self._replace_global_repcaps(query)
 		with self._lock:
 			try:
 				self._log_start_segment()
-				query = self._replace_global_repcaps(query)
 				self.start_send_read_event(query, False)
 				self._call_pre_query_handler(query, block_callback)
 				response = self._session.query_str(query)
 				self.end_send_read_event()
-				self._log_info(log_info, f'{query} {response}', query)
+				if self.logger.enabled:
+					self._log_info(log_info, f'{query} {response}', query)
 				self.check_status()
 			except RsInstrException as e:
 				self._log_exception(e, query, log_info)
@@ -751,17 +832,19 @@ class Instrument(object):
 		Also performs error checking if the self.query_instr_status is true.
 		The response is trimmed of any trailing LF characters and has no length limit.
 		If you do not provide timeout, the method uses current opc_timeout."""
+		query = self._replace_global_repcaps(query)
 		with self._lock:
 			try:
 				self._log_start_segment()
-				query = self._replace_global_repcaps(query)
+				session = self._session
 				self.start_send_read_event(query, True)
 				self._call_pre_query_handler(query, block_callback)
-				response = self._session.query_str_with_opc(query, timeout, log_info)
+				response = session.query_str_with_opc(query, timeout, log_info)
 				self.end_send_read_event()
-				if self._session.clear_status_after_query_with_opc():
-					self._session.query_and_clear_esr()
-				self._log_info(log_info, f'{query} {response}', query)
+				if session.clear_status_after_query_with_opc():
+					session.query_and_clear_esr()
+				if self.logger.enabled:
+					self._log_info(log_info, f'{query} {response}', query)
 				self.check_status()
 			except RsInstrException as e:
 				self._log_exception(e, query, log_info)
@@ -773,18 +856,19 @@ class Instrument(object):
 	def query_bin_block(self, query: str, log_info: str = 'Query binary block') -> bytes:
 		"""Queries binary data block to bytes and returns data as bytes.
 		Throws an exception if the returned data was not a binary data."""
+		query = self._replace_global_repcaps(query)
 		with self._lock:
 			with StreamWriter.as_bin_var() as stream:
 				try:
 					log_info = f'{log_info} {query}'
 					self._log_start_segment()
-					query = self._replace_global_repcaps(query)
 					self.start_send_read_event(query, False)
 					self._call_pre_query_handler(query, False)
 					self._session.query_bin_block(query, stream, True)
 					self.end_send_read_event()
 					content = stream.content
-					self._log_info_var_stream(f'{log_info}, received', stream.binary, content, query)
+					if self.logger.enabled:
+						self._log_info_var_stream(f'{log_info}, received', stream.binary, content, query)
 					self.check_status()
 				except RsInstrException as e:
 					self._log_exception(e, query, log_info)
@@ -796,19 +880,20 @@ class Instrument(object):
 	def query_bin_block_with_opc(self, query: str, timeout: int = None, log_info: str = 'Query binary block with OPC') -> bytes:
 		"""Sends a OPC-synced query and returns data as bytes.
 		If you do not provide timeout, the method uses current opc_timeout."""
+		query = self._replace_global_repcaps(query)
 		with self._lock:
 			with StreamWriter.as_bin_var() as stream:
 				try:
 					log_info = f'{log_info} {query}'
 					self._log_start_segment()
-					query = self._replace_global_repcaps(query)
 					self.start_send_read_event(query, True)
 					self._call_pre_query_handler(query, False)
 					self._session.query_bin_block_with_opc(query, stream, True, timeout)
 					self.end_send_read_event()
 					self._session.query_and_clear_esr()
 					content = stream.content
-					self._log_info_var_stream(f'{log_info}, received', stream.binary, content, query)
+					if self.logger.enabled:
+						self._log_info_var_stream(f'{log_info}, received', stream.binary, content, query)
 					self.check_status()
 				except RsInstrException as e:
 					self._log_exception(e, query, log_info)
@@ -822,17 +907,18 @@ class Instrument(object):
 		If append is False, any existing file content is discarded.
 		If append is True, the new content is added to the end of the existing file, or if the file does not exit, it is created.
 		Throws an exception if the returned data was not a binary data."""
+		query = self._replace_global_repcaps(query)
 		with self._lock:
 			with StreamWriter.as_bin_file(file_path, append) as stream:
 				try:
 					self._log_start_segment()
-					query = self._replace_global_repcaps(query)
 					self.start_send_read_event(query, False)
 					self._call_pre_query_handler(query, False)
 					self._session.query_bin_block(query, stream, True)
 					self.end_send_read_event()
 					add_str = 'target file' if append is False else 'appended to target file'
-					self._log_info(log_info, f'Query {query} - written {size_to_kb_mb_string(stream.written_len, True)}, {add_str} {file_path}', query)
+					if self.logger.enabled:
+						self._log_info(log_info, f'Query {query} - written {size_to_kb_mb_string(stream.written_len, True)}, {add_str} {file_path}', query)
 					self.check_status()
 				except RsInstrException as e:
 					self._log_exception(e, query, log_info)
@@ -845,12 +931,12 @@ class Instrument(object):
 		If append is False, any existing file content is discarded.
 		If append is True, the new content is added to the end of the existing file, or if the file does not exit, it is created.
 		Throws an exception if the returned data was not a binary data."""
+		query = self._replace_global_repcaps(query)
 		with self._lock:
 			with StreamWriter.as_bin_file(file_path, append) as stream:
 				try:
 
 					self._log_start_segment()
-					query = self._replace_global_repcaps(query)
 					self.start_send_read_event(query, True)
 					self._call_pre_query_handler(query, False)
 					self._session.query_bin_block_with_opc(query, stream, True, timeout)
@@ -858,7 +944,38 @@ class Instrument(object):
 					if self._session.clear_status_after_query_with_opc():
 						self._session.query_and_clear_esr()
 					add_str = 'target file' if append is False else 'appended to target file'
-					self._log_info(log_info, f'Query {query} - written {size_to_kb_mb_string(stream.written_len, True)}, {add_str} {file_path}', query)
+					if self.logger.enabled:
+						self._log_info(log_info, f'Query {query} - written {size_to_kb_mb_string(stream.written_len, True)}, {add_str} {file_path}', query)
+					self.check_status()
+				except RsInstrException as e:
+					self._log_exception(e, query, log_info)
+					raise
+				finally:
+					self._log_end_segment()
+
+	def query_bin_float_list_in_chunks(self, query: str, handler: Callable, chunk_samples: int = 65536, log_info='Query binary float list in chunks') -> None:
+		"""Queries binary data block of float numbers and sends them to the handler in lists of chunk_samples numbers, as the data arrive.
+		The last list can be shorter. Unlike the query_bin_or_ascii_float_list(), the whole response is never held in memory.
+		The numbers are decoded with the current bin_float_numbers_format. Handler prototype: handler(numbers: List[float])
+		Throws an exception if the returned data was not a binary data."""
+		if self._simulating:
+			numbers = self.query_bin_or_ascii_float_list(query)
+			for start in range(0, len(numbers), chunk_samples):
+				handler(numbers[start:start + chunk_samples])
+			return
+		decoder = Conv.BinFloatListDecoder(self.bin_float_numbers_format, chunk_samples, handler)
+		query = self._replace_global_repcaps(query)
+		with self._lock:
+			with StreamWriter.as_bin_handler(decoder.write) as stream:
+				try:
+					self._log_start_segment()
+					self.start_send_read_event(query, False)
+					self._call_pre_query_handler(query, False)
+					self._session.query_bin_block(query, stream, True)
+					self.end_send_read_event()
+					decoder.flush()
+					if self.logger.enabled:
+						self._log_info(log_info, f'Query {query} - decoded {size_to_kb_mb_string(stream.written_len, True)} in chunks of {chunk_samples} numbers', query)
 					self.check_status()
 				except RsInstrException as e:
 					self._log_exception(e, query, log_info)
@@ -868,54 +985,48 @@ class Instrument(object):
 
 	def query_int(self, query: str) -> int:
 		"""Sends a query and reads response from the instrument as integer."""
-		with self._lock:
-			string = self.query_str(query, log_info='Query integer')
-			if self._simulating and self._sim_cached_value_not_found(string):
-				return 0
-			return Conv.str_to_int(string)
+		string = self.query_str(query, log_info='Query integer')
+		if self._simulating and self._sim_cached_value_not_found(string):
+			return 0
+		return Conv.str_to_int(string)
 
 	def query_int_with_opc(self, query: str, timeout: int = None) -> int:
 		"""Sends a OPC-synced query and reads response from the instrument as integer number.
 		If you do not provide timeout, the method uses current opc_timeout."""
-		with self._lock:
-			string = self.query_str_with_opc(query, timeout, log_info='Query integer with OPC')
-			if self._simulating and self._sim_cached_value_not_found(string):
-				return 0
-			return Conv.str_to_int(string)
+		string = self.query_str_with_opc(query, timeout, log_info='Query integer with OPC')
+		if self._simulating and self._sim_cached_value_not_found(string):
+			return 0
+		return Conv.str_to_int(string)
 
 	def query_float(self, query: str) -> float:
 		"""Sends a query and reads response from the instrument as float number."""
-		with self._lock:
-			string = self.query_str(query, log_info='Query float')
-			if self._simulating and self._sim_cached_value_not_found(string):
-				return 0.0
-			return Conv.str_to_float(string)
+		string = self.query_str(query, log_info='Query float')
+		if self._simulating and self._sim_cached_value_not_found(string):
+			return 0.0
+		return Conv.str_to_float(string)
 
 	def query_float_with_opc(self, query: str, timeout: int = None) -> float:
 		"""Sends a OPC-synced query and reads response from the instrument as float number.
 		If you do not provide timeout, the method uses current opc_timeout."""
-		with self._lock:
-			string = self.query_str_with_opc(query, timeout, log_info='Query float with OPC')
-			if self._simulating and self._sim_cached_value_not_found(string):
-				return 0.0
-			return Conv.str_to_float(string)
+		string = self.query_str_with_opc(query, timeout, log_info='Query float with OPC')
+		if self._simulating and self._sim_cached_value_not_found(string):
+			return 0.0
+		return Conv.str_to_float(string)
 
 	def query_bool(self, query: str) -> bool:
 		"""Sends a query and reads response from the instrument as boolean value."""
-		with self._lock:
-			string = self.query_str(query, log_info='Query boolean')
-			if self._simulating and self._sim_cached_value_not_found(string):
-				return False
-			return Conv.str_to_bool(string)
+		string = self.query_str(query, log_info='Query boolean')
+		if self._simulating and self._sim_cached_value_not_found(string):
+			return False
+		return Conv.str_to_bool(string)
 
 	def query_bool_with_opc(self, query: str, timeout: int = None) -> bool:
 		"""Sends a OPC-synced query and reads response from the instrument as boolean value.
 		If you do not provide timeout, the method uses current opc_timeout."""
-		with self._lock:
-			string = self.query_str_with_opc(query, timeout, log_info='Query boolean with OPC')
-			if self._simulating and self._sim_cached_value_not_found(string):
-				return False
-			return Conv.str_to_bool(string)
+		string = self.query_str_with_opc(query, timeout, log_info='Query boolean with OPC')
+		if self._simulating and self._sim_cached_value_not_found(string):
+			return False
+		return Conv.str_to_bool(string)
 
 	def query_str_list(self, query: str, remove_blank_response: bool = False) -> List[str]:
 		"""Sends a query and reads response from the instrument as a csv-list.
@@ -923,12 +1034,11 @@ class Instrument(object):
 		Meaning of the 'remove_blank_response':
 			- False(default): whitespaces-only response is returned as a list with one empty element [''].
 			- True: whitespaces-only response is returned as an empty list []."""
-		with self._lock:
-			string = self.query_str(query, log_info='Query string list')
-			if self._simulating and self._sim_cached_value_not_found(string):
-				string = 'AAA,BBB,CCC,DDD,EEE,FFF,GGG,HHH,III,JJJ'
-			response = Conv.str_to_str_list(string, remove_blank_response)
-			return response
+		string = self.query_str(query, log_info='Query string list')
+		if self._simulating and self._sim_cached_value_not_found(string):
+			string = 'AAA,BBB,CCC,DDD,EEE,FFF,GGG,HHH,III,JJJ'
+		response = Conv.str_to_str_list(string, remove_blank_response)
+		return response
 
 	def query_str_list_with_opc(self, query: str, timeout: int = None, remove_blank_response: bool = False) -> List[str]:
 		"""Sends a OPC-synced query and reads response from the instrument as csv-list.
@@ -936,48 +1046,46 @@ class Instrument(object):
 		Meaning of the 'remove_blank_response':
 			- False(default): whitespaces-only response is returned as a list with one empty element [''].
 			- True: whitespaces-only response is returned as an empty list []."""
-		with self._lock:
-			string = self.query_str_with_opc(query, timeout, log_info='Query string list with OPC')
-			if self._simulating and self._sim_cached_value_not_found(string):
-				string = 'AAA,BBB,CCC,DDD,EEE,FFF,GGG,HHH,III,JJJ'
-			response = Conv.str_to_str_list(string, remove_blank_response)
-			return response
+		string = self.query_str_with_opc(query, timeout, log_info='Query string list with OPC')
+		if self._simulating and self._sim_cached_value_not_found(string):
+			string = 'AAA,BBB,CCC,DDD,EEE,FFF,GGG,HHH,III,JJJ'
+		response = Conv.str_to_str_list(string, remove_blank_response)
+		return response
 
 	def query_bool_list(self, query: str) -> List[bool]:
 		"""Sends a query and reads response from the instrument as csv-list of booleans.
 		Blank or empty response is returned as an empty list."""
-		with self._lock:
-			string = self.query_str(query, log_info='Query boolean list')
-			if self._simulating and self._sim_cached_value_not_found(string):
-				string = 'True,False,0,1,1,True,true,false,true,false'
-			response = Conv.str_to_bool_list(string)
-			return response
+		string = self.query_str(query, log_info='Query boolean list')
+		if self._simulating and self._sim_cached_value_not_found(string):
+			string = 'True,False,0,1,1,True,true,false,true,false'
+		response = Conv.str_to_bool_list(string)
+		return response
 
 	def query_bool_list_with_opc(self, query: str, timeout: int = None) -> List[bool]:
 		"""Sends a OPC-synced query and reads response from the instrument as csv-list of booleans.
 		Blank or empty response is returned as an empty list.
 		If you do not provide timeout, the method uses current opc_timeout."""
-		with self._lock:
-			string = self.query_str_with_opc(query, timeout, log_info='Query boolean list with OPC')
-			if self._simulating and self._sim_cached_value_not_found(string):
-				string = 'True,False,0,1,1,True,true,false,true,false'
-			response = Conv.str_to_bool_list(string)
-			return response
+		string = self.query_str_with_opc(query, timeout, log_info='Query boolean list with OPC')
+		if self._simulating and self._sim_cached_value_not_found(string):
+			string = 'True,False,0,1,1,True,true,false,true,false'
+		response = Conv.str_to_bool_list(string)
+		return response
 
 	def write_bin_block(self, cmd: str, payload: bytes, log_info: str = 'Write binary block') -> None:
 		"""Writes all the payload as binary data block to the instrument.
 		The binary data header is added at the beginning of the transmission automatically, do not include it in the payload!!!"""
+		cmd = self._replace_global_repcaps(cmd)
 		with self._lock:
 			try:
 				self._log_start_segment()
-				cmd = self._replace_global_repcaps(cmd)
 				self._call_before_write_handler(cmd, False)
 				stream = StreamReader.as_bin_var(payload)
 				if self.on_write_handler:
 					self.start_send_write_bin_event(cmd)
 				self._session.write_bin_block(cmd, stream)
 				self.end_send_write_bin_event()
-				self._log_info_bin(f'{log_info} {cmd}, binary data', payload, cmd)
+				if self.logger.enabled:
+					self._log_info_bin(f'{log_info} {cmd}, binary data', payload, cmd)
 				self.check_status()
 			except RsInstrException as e:
 				self._log_exception(e, cmd, log_info)
@@ -988,17 +1096,18 @@ class Instrument(object):
 	def write_bin_block_from_file(self, cmd: str, file_path: str, log_info: str = 'Write binary block from file') -> None:
 		"""Writes all the file content as binary data block to the instrument.
 		The binary data header is added at the beginning of the transmission automatically, do not include it in the file content!!!"""
+		cmd = self._replace_global_repcaps(cmd)
 		with self._lock:
 			with StreamReader.as_bin_file(file_path) as stream:
 				try:
 					self._log_start_segment()
-					cmd = self._replace_global_repcaps(cmd)
 					self._call_before_write_handler(cmd, False)
 					if self.on_write_handler:
 						self.start_send_write_bin_event(cmd)
 					self._session.write_bin_block(cmd, stream)
 					self.end_send_write_bin_event()
-					self._log_info(log_info, f'Command {cmd} - written {size_to_kb_mb_string(stream.read_len, True)}, source file {file_path}', cmd)
+					if self.logger.enabled:
+						self._log_info(log_info, f'Command {cmd} - written {size_to_kb_mb_string(stream.read_len, True)}, source file {file_path}', cmd)
 					self.check_status()
 				except RsInstrException as e:
 					self._log_exception(e, cmd, log_info)
@@ -1031,7 +1140,7 @@ class Instrument(object):
 				length = self._session.get_bin_data_length(query)
 				if length is None:
 					self._log_info(log_info, f'File {instr_file} does not exist.', query)
-				else:
+				elif self.logger.enabled:
 					self._log_info(log_info, f'File {instr_file} exists, size {size_to_kb_mb_string(length, True)}', query)
 				self.check_status()
 				return length
@@ -1045,11 +1154,11 @@ class Instrument(object):
 		"""Queries a list of floating-point numbers that can be read in ASCII format or in binary format.
 		- For ASCII format, the list numbers are decoded as comma-separated values.
 		- For Binary Format, the numbers are decoded based on the property BinFloatFormat, usually float 32-bit (FORM REAL,32)."""
+		query = self._replace_global_repcaps(query)
 		with self._lock:
 			try:
 				log_info = f'{log_info} {query}'
 				self._log_start_segment()
-				query = self._replace_global_repcaps(query)
 				self.start_send_read_event(query, False)
 				stream = StreamWriter.as_bin_var()
 				self._call_pre_query_handler(query, False)
@@ -1059,7 +1168,8 @@ class Instrument(object):
 					return [0.1, 1.2, 2.3, 3.4, 4.5, 5.6, 6.7, 7.8, 8.9, 9.1, 10.2]
 				if stream.binary:
 					result = Conv.bytes_to_list_of_floats(stream.content, self.bin_float_numbers_format)
-					self._log_info_list(f'{log_info}, received binary format list {size_to_kb_mb_string(stream.written_len, True)} {stream.written_len // len(result)} bytes per number', result, query)
+					if self.logger.enabled:
+						self._log_info_list(f'{log_info}, received binary format list {size_to_kb_mb_string(stream.written_len, True)} {stream.written_len // max(len(result), 1)} bytes per number', result, query)
 				else:
 					result = Conv.str_to_float_list(stream.content)
 					self._log_info_list(f'{log_info}, received ascii format list', result, query)
@@ -1076,11 +1186,11 @@ class Instrument(object):
 		- For ASCII format, the list numbers are decoded as comma-separated values.
 		- For Binary Format, the numbers are decoded based on the property BinFloatFormat, usually float 32-bit (FORM REAL,32).
 		If you do not provide timeout, the method uses current opc_timeout."""
+		query = self._replace_global_repcaps(query)
 		with self._lock:
 			try:
 				log_info = f'{log_info} {query}'
 				self._log_start_segment()
-				query = self._replace_global_repcaps(query)
 				self.start_send_read_event(query, True)
 				stream = StreamWriter.as_bin_var()
 				self._call_pre_query_handler(query, False)
@@ -1090,7 +1200,8 @@ class Instrument(object):
 					return [0.1, 1.2, 2.3, 3.4, 4.5, 5.6, 6.7, 7.8, 8.9, 9.1, 10.2]
 				if stream.binary:
 					result = Conv.bytes_to_list_of_floats(stream.content, self.bin_float_numbers_format)
-					self._log_info_list(f'{log_info}, received binary format list {size_to_kb_mb_string(stream.written_len, True)} {stream.written_len // len(result)} bytes per number', result, query)
+					if self.logger.enabled:
+						self._log_info_list(f'{log_info}, received binary format list {size_to_kb_mb_string(stream.written_len, True)} {stream.written_len // max(len(result), 1)} bytes per number', result, query)
 				else:
 					result = Conv.str_to_float_list(stream.content)
 					self._log_info_list(f'{log_info}, received ascii format list', result, query)
@@ -1129,11 +1240,11 @@ class Instrument(object):
 		"""Queries a list of integer numbers that can be read in ASCII format or in binary format.
 		- For ASCII format, the list numbers are decoded as comma-separated values.
 		- For Binary Format, the numbers are decoded based on the property BinIntFormat, usually int 32-bit (FORM REAL,32)."""
+		query = self._replace_global_repcaps(query)
 		with self._lock:
 			try:
 				log_info = f'{log_info} {query}'
 				self._log_start_segment()
-				query = self._replace_global_repcaps(query)
 				self.start_send_read_event(query, False)
 				stream = StreamWriter.as_bin_var()
 				self._call_pre_query_handler(query, False)
@@ -1143,7 +1254,8 @@ class Instrument(object):
 					return [1, 2, 3, 5, 10, 15, 20, 30, 50, 100]
 				if stream.binary:
 					result = Conv.bytes_to_list_of_integers(stream.content, self.bin_int_numbers_format)
-					self._log_info_list(f'{log_info}, received binary format list {size_to_kb_mb_string(stream.written_len, True)} {stream.written_len // len(result)} bytes per number', result, query)
+					if self.logger.enabled:
+						self._log_info_list(f'{log_info}, received binary format list {size_to_kb_mb_string(stream.written_len, True)} {stream.written_len // max(len(result), 1)} bytes per number', result, query)
 				else:
 					result = Conv.str_to_int_list(stream.content)
 					self._log_info_list(f'{log_info}, received ascii format list', result, query)
@@ -1160,11 +1272,11 @@ class Instrument(object):
 		- For ASCII format, the list numbers are decoded as comma-separated values.
 		- For Binary Format, the numbers are decoded based on the property BinIntFormat, usually int 32-bit (FORM REAL,32).
 		If you do not provide timeout, the method uses current opc_timeout."""
+		query = self._replace_global_repcaps(query)
 		with self._lock:
 			try:
 				log_info = f'{log_info} {query}'
 				self._log_start_segment()
-				query = self._replace_global_repcaps(query)
 				self.start_send_read_event(query, True)
 				stream = StreamWriter.as_bin_var()
 				self._call_pre_query_handler(query, False)
@@ -1174,7 +1286,8 @@ class Instrument(object):
 					return [1, 2, 3, 5, 10, 15, 20, 30, 50, 100]
 				if stream.binary:
 					result = Conv.bytes_to_list_of_integers(stream.content, self.bin_int_numbers_format)
-					self._log_info_list(f'{log_info}, received binary format list {size_to_kb_mb_string(stream.written_len, True)} {stream.written_len // len(result)} bytes per number', result, query)
+					if self.logger.enabled:
+						self._log_info_list(f'{log_info}, received binary format list {size_to_kb_mb_string(stream.written_len, True)} {stream.written_len // max(len(result), 1)} bytes per number', result, query)
 				else:
 					result = Conv.str_to_int_list(stream.content)
 					self._log_info_list(f'{log_info}, received ascii format list', result, query)
@@ -1259,11 +1372,11 @@ class Instrument(object):
 			if timeout is None or timeout == 0:
 				timeout = self._settings.selftest_timeout
 			response = self.query_str_with_opc('*TST?', timeout, log_info='Self Test')
-			m = re.search(r'^(-?\d+)(,(.*))?', response)
+			m = _TST_RE.match(response)
 			if not m:
 				raise UnexpectedResponseException(self.resource_name, f"Unexpected response to a '*TST?' self-test query: '{response}'")
 			code = Conv.str_to_int(m.group(1))
-			msg = Utilities.trim_str_response(m.group(3))
+			msg = Utilities.trim_str_response(m.group(2))
 			self.check_status()
 			return code, msg
 
@@ -1351,66 +1464,67 @@ class Instrument(object):
 			args.data = cmd
 		self.on_write_handler(args)
 
+	@staticmethod
+	def _update_chunk_event_args(args: IoTransferEventArgs, visa_args: EventArgsChunk) -> IoTransferEventArgs:
+		"""Copies the chunk transfer state from the VisaSession event to the IoTransferEventArgs."""
+		args.end_of_transfer = visa_args.end_of_transfer
+		args.chunk_ix = visa_args.chunk_ix
+		args.total_chunks = visa_args.total_chunks
+		args.chunk_size = visa_args.chunk_size
+		args.transferred_size = visa_args.transferred_size
+		args.total_size = visa_args.total_size
+		args.data = visa_args.data
+		args.binary = visa_args.binary
+		return args
+
+	def _on_read_chunk(self, visa_args: EventArgsChunk) -> None:
+		"""Receives events from VisaSession on read chunk transfers, and sends them as IoTransferEventArgs to the Instrument.on_read_handler()"""
+		self.on_read_handler(self._update_chunk_event_args(self._read_event_args, visa_args))
+
+	def _on_write_chunk(self, visa_args: EventArgsChunk) -> None:
+		"""Receives events from VisaSession on write chunk transfers, and sends them as IoTransferEventArgs to the Instrument.on_write_handler()"""
+		self.on_write_handler(self._update_chunk_event_args(self._write_event_args, visa_args))
+
 	def start_send_read_event(self, query: str, opc_sync: bool) -> None:
 		"""Registers VisaSession.on_read_chunk_handler() which then generates events with each chunk transfer.
-		Event handler for these events is the local function of this method, which sends IoTransferEventArgs further up to the Instrument.on_read_handler()"""
+		The handler is the bound method _on_read_chunk(), which sends IoTransferEventArgs further up to the Instrument.on_read_handler()"""
 		if not self.on_read_handler:
 			return
-
-		def _read_chunk_handler(visa_args: EventArgsChunk) -> None:
-			"""Receives events from VisaSession on read chunk transfers, and sends them as IoTransferEventArgs to the Instrument.on_read_handler()"""
-			args.end_of_transfer = visa_args.end_of_transfer
-			args.chunk_ix = visa_args.chunk_ix
-			args.total_chunks = visa_args.total_chunks
-			args.chunk_size = visa_args.chunk_size
-			args.transferred_size = visa_args.transferred_size
-			args.total_size = visa_args.total_size
-			args.data = visa_args.data
-			args.binary = visa_args.binary
-			self.on_read_handler(args)
-
-		args = IoTransferEventArgs.read_chunk(opc_sync, query)
-		args = self.event_args_append_instr_info(args)
-		self._session.on_read_chunk_handler = _read_chunk_handler
+		self._read_event_args = self.event_args_append_instr_info(IoTransferEventArgs.read_chunk(opc_sync, query))
+		self._session.on_read_chunk_handler = self._on_read_chunk
 
 	def end_send_read_event(self):
-		"""Unregisters VisaSession.on_read_chunk_handler()"""
+		"""Unregisters VisaSession.on_read_chunk_handler(). Without the registered handler (the common case), returns immediately."""
+		if self._read_event_args is None:
+			return
 		self._session.on_read_chunk_handler = None
+		self._read_event_args = None
 
 	def start_send_write_bin_event(self, cmd: str) -> None:
 		"""Registers VisaSession.on_write_chunk_handler() which then generates events with each chunk transfer.
-		Event handler for these events is the local function of this method, which sends IoTransferEventArgs further up to the Instrument.on_write_handler()"""
+		The handler is the bound method _on_write_chunk(), which sends IoTransferEventArgs further up to the Instrument.on_write_handler()"""
 		if not self.on_write_handler:
 			return
-
-		def _write_chunk_handler(visa_args: EventArgsChunk) -> None:
-			"""Receives events from VisaSession on write chunk transfers, and sends them as IoTransferEventArgs to the Instrument.on_write_handler()"""
-			args.end_of_transfer = visa_args.end_of_transfer
-			args.chunk_ix = visa_args.chunk_ix
-			args.total_chunks = visa_args.total_chunks
-			args.chunk_size = visa_args.chunk_size
-			args.transferred_size = visa_args.transferred_size
-			args.total_size = visa_args.total_size
-			args.data = visa_args.data
-			args.binary = visa_args.binary
-			self.on_write_handler(args)
-
-		args = IoTransferEventArgs.write_bin(cmd)
-		args = self.event_args_append_instr_info(args)
-		self._session.on_write_chunk_handler = _write_chunk_handler
+		self._write_event_args = self.event_args_append_instr_info(IoTransferEventArgs.write_bin(cmd))
+		self._session.on_write_chunk_handler = self._on_write_chunk
 
 	def end_send_write_bin_event(self):
-		"""Unregisters VisaSession.on_write_chunk_handler()"""
+		"""Unregisters VisaSession.on_write_chunk_handler(). Without the registered handler (the common case), returns immediately."""
+		if self._write_event_args is None:
+			return
 		self._session.on_write_chunk_handler = None
+		self._write_event_args = None
 
 	def _call_before_write_handler(self, cmd: str, block_callback: bool) -> None:
 		"""Calls the _pre_write_handler if defined. Used in all the base write methods."""
-		if block_callback is False and self._before_write_handler:
+		# The handler is checked first, without it (the common case) this is the only test
+		if self._before_write_handler and block_callback is False:
 			self._before_write_handler(self, cmd)
 
 	def _call_pre_query_handler(self, query: str, block_callback: bool) -> None:
 		"""Calls the _pre_query_handler if defined. Used in all the base query methods."""
-		if block_callback is False and self._before_query_handler:
+		# The handler is checked first, without it (the common case) this is the only test
+		if self._before_query_handler and block_callback is False:
 			self._before_query_handler(self, query)
 
 	@property
@@ -5,6 +5,8 @@ from typing import List, Tuple
 
 class RsInstrException(Exception):
 	"""Exception base class for all the RsInstrument exceptions."""
+	__slots__ = ('message',)
+
 	def __init__(self, message: str):
 		super(RsInstrException, self).__init__(message)
 		self.message = message
@@ -12,6 +14,8 @@ class RsInstrException(Exception):
 
 class TimeoutException(RsInstrException):
 	"""Exception for timeout errors."""
+	__slots__ = ()
+
 	def __init__(self, message: str):
 		super(TimeoutException, self).__init__(message)
 
@@ -19,6 +23,8 @@ class TimeoutException(RsInstrException):
 class StatusException(RsInstrException):
 	"""Exception for instrument status errors.
 	Tje field  errors_list contains the complete list of all the errors with messages and codes."""
+	__slots__ = ('rsrc_name', 'first_exc', 'errors_list')
+
 	def __init__(self, rsrc_name: str, message: str, errors_list: List[Tuple[int, str]], first_exc: type = None):
 		self.rsrc_name: str = rsrc_name
 		self.first_exc: type = first_exc
@@ -28,6 +34,8 @@ class StatusException(RsInstrException):
 
 class UnexpectedResponseException(RsInstrException):
 	"""Exception for instrument unexpected responses."""
+	__slots__ = ('rsrc_name',)
+
 	def __init__(self, rsrc_name: str, message: str):
 		self.rsrc_name: str = rsrc_name
 		super(UnexpectedResponseException, self).__init__(message)
@@ -35,6 +43,8 @@ class UnexpectedResponseException(RsInstrException):
 
 class ResourceError(RsInstrException):
 	"""Exception for resource name - e.g. resource not found."""
+	__slots__ = ('rsrc_name',)
+
 	def __init__(self, rsrc_name: str, message: str):
 		self.rsrc_name: str = rsrc_name
 		super(ResourceError, self).__init__(message)
@@ -42,6 +52,8 @@ class ResourceError(RsInstrException):
 
 class DriverValueError(RsInstrException):
 	"""Exception for different driver value settings e.g. RepCap values or Enum values."""
+	__slots__ = ('rsrc_name',)
+
 	def __init__(self, rsrc_name: str, message: str):
 		self.rsrc_name: str = rsrc_name
 		super(DriverValueError, self).__init__(message)
@@ -50,19 +62,18 @@ class DriverValueError(RsInstrException):
 def get_instrument_status_errors(rsrc_name: str, errors: List[Tuple[int, str]], context: str = '') -> str or None:
 	"""Checks the errors list and of it contains at least one element, it returns the error message.
 	Otherwise, it returns None."""
-	if errors is None or len(errors) == 0:
-		return
+	if not errors:
+		return None
 	if context:
 		message = f"'{rsrc_name}': {context} "
 	else:
 		message = f"'{rsrc_name}': "
-	errors_msg = '\n'.join([f'{x[0]},"{x[1]}"' for x in errors])
 	if len(errors) == 1:
-		message += f'Instrument error detected: {errors_msg}'
-		return message
-	if len(errors) > 1:
-		message += f'{len(errors)} Instrument errors detected:\n{errors_msg}'
-		return message
+		# The common case, formatted directly
+		code, text = errors[0]
+		return f'{message}Instrument error detected: {code},"{text}"'
+	errors_msg = '\n'.join([f'{x[0]},"{x[1]}"' for x in errors])
+	return f'{message}{len(errors)} Instrument errors detected:\n{errors_msg}'
 
 
 def assert_no_instrument_status_errors(rsrc_name: str, errors: List[Tuple[int, str]], context: str = '', first_exc=None) -> None:
@@ -1,11 +1,34 @@
 """See the class docstring."""
 
 import re
+from bisect import bisect_left
 from enum import Enum
-from typing import List
+from functools import lru_cache
+from sys import intern
+from typing import List, Dict
 
 from .Utilities import trim_str_response
 
+# Option name parts: prefix, K/B, number, suffix
+_PARSE_RE = re.compile(r'(.?)(K|B)(\d+)(.*)$', re.ASCII)
+
+
+@lru_cache(maxsize=64)
+def _compile_option_regex(pattern: str):
+	"""Returns the compiled case-insensitive has_regex() pattern. Drivers check the same patterns repeatedly."""
+	return re.compile(pattern, re.IGNORECASE)
+
+
+def _get_sort_key(option: str, m=None) -> tuple:
+	"""Returns the sort key of the option: (prefix with K/B weight, number, suffix).
+	The options not matching the pattern are sorted only by their name.
+	If you already have the option's _PARSE_RE match, enter it as 'm'."""
+	if m is None:
+		m = _PARSE_RE.match(option)
+	if m:
+		return m.group(1) + ('02' if m.group(2) == 'B' else '01'), int(m.group(3)), m.group(4)
+	return (option,)
+
 
 class ParseMode(Enum):
 	"""Options parse mode enum."""
@@ -16,19 +39,74 @@ class ParseMode(Enum):
 	Auto = 4
 
 
+def _split_options(options_str: str, mode: ParseMode) -> Dict[str, tuple or None]:
+	"""Splits the *OPT? response to the options, the dashed ones are resolved based on the mode.
+	Returns the options without duplicates, with their sort keys if already known, otherwise None."""
+	options = trim_str_response(options_str).split(',')
+	new_opts = {}
+	for x in options:
+		if '-' not in x:
+			# Most of the options have no dash, they are taken as they are
+			if x:
+				new_opts.setdefault(x, None)
+			continue
+
+		before, _, after = x.partition('-')
+		# The 'before' contains no dash. The strip() removes more adjacent dashes of the 'after', e.g. 'SMW--K22'
+		after = after.strip('-')
+
+		if mode is ParseMode.KeepBeforeDash:
+			x = before
+
+		elif mode is ParseMode.KeepAfterDash:
+			x = after
+
+		elif mode is ParseMode.Auto:
+			found_before = _PARSE_RE.match(before)
+			found_after = _PARSE_RE.match(after)
+			# The pattern matches the whole string, so the longer part wins
+			if found_before and found_after:
+				found_before = None if len(after) >= len(before) else found_before
+			if found_before:
+				# The match is reused for the sort key, the option is not parsed again
+				new_opts[before] = _get_sort_key(before, found_before)
+				continue
+			if found_after:
+				new_opts[after] = _get_sort_key(after, found_after)
+				continue
+
+		if x:
+			new_opts.setdefault(x, None)
+
+	return new_opts
+
+
+@lru_cache(maxsize=128)
+def _parse_options(options_str: str, mode: ParseMode) -> tuple:
+	"""Returns the sorted (sort_key, option) items of the *OPT? response, without duplicates.
+	Cached, the reconnected sessions and the sessions of the same instrument type get the same response.
+	The result is immutable, each Options instance makes its own lists from it."""
+	items = _split_options(options_str, mode).items()
+	return tuple(sorted((_get_sort_key(x) if key is None else key, intern(x)) for x, key in items))
+
+
 class Options(object):
 	"""Class for handling the instrument options - parsing from the *OPT? string and providing methods:
 	- get_all()
 	- contains()
 	- contains_regex()
 	- has_k0()"""
-	_optionsList = []
-	_optionsListUc = []
-	_has_k0: bool = False
-	_parse_patt = r'(.?)(K|B)(\d+)(.*)$'
+
+	__slots__ = ('_optionsList', '_sortedItems', '_optionsSetUc', '_has_k0')
 
 	def __init__(self, options_str: str, mode=ParseMode.Auto):
 		"""Initializes the options with the *OPT? return string."""
+		self._optionsList: List[str] = []
+		# Sorted (sort_key, option) tuples, parallel to the self._optionsList. Used for the incremental add() and remove()
+		self._sortedItems: List[tuple] = []
+		# Upper-case options for the case-insensitive has()
+		self._optionsSetUc = set()
+		self._has_k0: bool = False
 		self._initialize_from_string(options_str, mode)
 
 	def __str__(self):
@@ -38,70 +116,48 @@ class Options(object):
 		"""Fills the self._optionsList from the entered 'options_str'."""
 		if mode == ParseMode.Skip:
 			return
+		self._set_sorted_items(_parse_options(options_str, mode))
 
-		options = trim_str_response(options_str).split(',')
-		new_opts = []
-		for x in options:
-			has_dash = '-' in x
-			if has_dash:
-				dash_ix = x.index('-')
-				before = x[0:dash_ix + 1].strip('-')
-				after = x[dash_ix:].strip('-')
-
-				if mode is ParseMode.KeepBeforeDash:
-					x = before
-
-				elif mode is ParseMode.KeepAfterDash:
-					x = after
-
-				elif mode is ParseMode.Auto:
-					found_before = re.match(self._parse_patt, before)
-					found_after = re.match(self._parse_patt, after)
-					if found_before is not None and found_after is not None:
-						x = after if len(found_after.group(0)) >= len(found_before.group(0)) else before
-					elif found_before is not None:
-						x = before
-					elif found_after is not None:
-						x = after
-
-			if len(x) > 0:
-				new_opts.append(x)
-
-		self._regenerate(new_opts)
-
-	def _regenerate(self, options: List[str]):
-		"""Regenerates the options again from the entered ones."""
-		# Remove duplicates
-		options = set(options)
-		# Create a weighting number
-		result = []
-		for x in options:
-			sort_value = x
-			m = re.match(self._parse_patt, x)
-			if m:
-				kb_weight = '02' if m.group(2) == 'B' else '01'
-				sort_value = '{0}{1}{2:09d}{3}'.format(m.group(1), kb_weight, int(m.group(3)), m.group(4))
-
-			result.append('{0} -> {1}'.format(sort_value, x))
-
-		# Sort keys in that dictionary and then reconstruct the original options
-		result.sort()
-		self._optionsList = [x.split(' -> ')[1] for x in result]
-		self._optionsListUc = [x.upper() for x in self._optionsList]
-		self._has_k0 = 'K0' in self._optionsListUc
+	def _set_sorted_items(self, sorted_items) -> None:
+		"""Sets the options from the sorted (sort_key, option) items."""
+		self._sortedItems = list(sorted_items)
+		self._optionsList = [x[1] for x in self._sortedItems]
+		self._update_uc_set()
+
+	def _update_uc_set(self) -> None:
+		"""Updates the upper-case options set and the K0 flag from the self._optionsList."""
+		# Interned, the sessions of the same instrument type share the strings
+		self._optionsSetUc = {intern(x.upper()) for x in self._optionsList}
+		self._has_k0 = 'K0' in self._optionsSetUc
+
+	def _find(self, option: str) -> tuple:
+		"""Returns the sorted item of the option and its position. The position is valid for inserting if the option does not exist."""
+		item = (_get_sort_key(option), option)
+		return item, bisect_left(self._sortedItems, item)
 
 	def add(self, option: str) -> None:
 		"""Adds new option if not already existing."""
-		self._optionsList.append(option)
-		self._regenerate(self._optionsList)
+		item, ix = self._find(option)
+		if ix < len(self._sortedItems) and self._sortedItems[ix] == item:
+			return
+		self._sortedItems.insert(ix, item)
+		self._optionsList.insert(ix, option)
+		option_uc = intern(option.upper())
+		self._optionsSetUc.add(option_uc)
+		if option_uc == 'K0':
+			self._has_k0 = True
 
 	def remove(self, option: str) -> None:
 		"""Removes the option if exists."""
-		try:
-			self._optionsList.remove(option.upper())
-			self._regenerate(self._optionsList)
-		except ValueError:
-			pass
+		option = option.upper()
+		item, ix = self._find(option)
+		if ix < len(self._sortedItems) and self._sortedItems[ix] == item:
+			del self._sortedItems[ix]
+			del self._optionsList[ix]
+			# Only the options with lower-case letters can have the same upper-case form
+			if not any(x.upper() == option for x in self._optionsList if not x.isupper()):
+				self._optionsSetUc.discard(option)
+				self._has_k0 = 'K0' in self._optionsSetUc
 
 	def get_all(self) -> List[str]:
 		"""Returns all the options."""
@@ -119,8 +175,8 @@ class Options(object):
 				# Simple string, no list, create list of one element
 				return [options]
 			else:
-				# String with '/' delimiter, create list out of it
-				return re.split(r'\s*/\s*', options)
+				# String with '/' delimiter, create list out of it. The callers strip the elements
+				return options.split('/')
 		else:
 			return options
 
@@ -132,14 +188,11 @@ class Options(object):
 		Example 2: options='k23 / K23e' returns true, if the instrument has either the option 'K23' or the option 'K23E'.
 		Example 3: options=['k11','K22'] returns true, if the instrument has either the option 'K11' or the option 'K22'."""
 		els = self._get_list_of_search_elements(options)
-		for el in els:
-			el = el.upper().strip()
-			if el.startswith('K') and self._has_k0:
-				return True
-
-			if el in self._optionsListUc:
-				return True
-		return False
+		# With K0, any K-option is present. Only the first character is checked, without upper-casing the elements
+		if self._has_k0 and any(el.lstrip()[:1] in ('K', 'k') for el in els):
+			return True
+		options_uc = self._optionsSetUc
+		return any(el.upper().strip() in options_uc for el in els)
 
 	def has_regex(self, re_options: str or List[str]) -> bool:
 		"""Returns true, if the entered regex string (case-insensitive) matches at least one of the installed options.
@@ -150,13 +203,12 @@ class Options(object):
 		Example 3: re_options=['k10.', 'k20.*'] returns true, if the instrument contains any options 'K10x' or 'K20xxx'."""
 		els = self._get_list_of_search_elements(re_options)
 
-		for el in els:
-			el = el.strip()
-			if el.upper().startswith('K') and self._has_k0:
+		# The same pattern entered more times is only tested once
+		for el in dict.fromkeys(x.strip() for x in els):
+			if self._has_k0 and el[:1] in ('K', 'k'):
 				return True
+			fullmatch = _compile_option_regex(el).fullmatch
 			for opt in self._optionsList:
-				matches = re.match(el, opt, re.IGNORECASE)
-				if matches:
-					if matches.group() == opt:
-						return True
+				if fullmatch(opt):
+					return True
 		return False
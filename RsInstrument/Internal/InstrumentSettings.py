@@ -2,8 +2,8 @@
 
 from enum import Enum
 from enum import Flag
-from re import search
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
 
 from . import InstrumentOptions as Opts
 from . import Conversions as Conv
@@ -11,6 +11,153 @@ from .ScpiLogger import LoggingMode
 from .Utilities import parse_token_to_key_and_value, trim_str_response
 
 
+def _add_init_token(tokens: dict, token: str, prefix: str) -> None:
+	"""Adds the key-value token to the tokens dictionary. Tokens with empty values are skipped."""
+	key, value = parse_token_to_key_and_value(token)
+	if value:
+		tokens[prefix + key.upper()] = value
+
+
+def _find_literal_end(text: str, ix: int) -> int:
+	"""Returns index after the closing single quote of the literal starting at ix.
+	Unclosed literal spans till the end of the text."""
+	end = text.find("'", ix + 1)
+	return len(text) if end < 0 else end + 1
+
+
+def _find_group_end(text: str, ix: int) -> int:
+	"""Returns index of the closing round bracket of the group opened at ix, or -1 if the group is not closed.
+	Brackets inside single-quoted literals do not close the group."""
+	length = len(text)
+	ix += 1
+	while ix < length:
+		ch = text[ix]
+		if ch == ')':
+			return ix
+		if ch == "'":
+			ix = _find_literal_end(text, ix)
+		else:
+			ix += 1
+	return -1
+
+
+def _get_group_name(head: str) -> str or None:
+	"""Returns the group name if the head of the token has the form '<groupName>=', otherwise None."""
+	head = head.rstrip()
+	if not head.endswith('='):
+		return None
+	name = head[:-1].strip()
+	if name and name.replace('_', 'a').isalnum():
+		return name
+	return None
+
+
+def _split_toplevel_commas(text: str, start: int, end: int):
+	"""Yields the tokens of text[start:end] delimited by commas.
+	Commas inside single-quoted literals or round brackets are not delimiters."""
+	tok_start = start
+	ix = start
+	while ix < end:
+		ch = text[ix]
+		if ch == "'":
+			ix = _find_literal_end(text, ix)
+			continue
+		if ch == '(':
+			bracket_end = _find_group_end(text, ix)
+			if 0 <= bracket_end < end:
+				ix = bracket_end + 1
+				continue
+		elif ch == ',':
+			yield text[tok_start:ix]
+			tok_start = ix + 1
+		ix += 1
+	yield text[tok_start:end]
+
+
+def _scan_init_string(text: str) -> dict:
+	"""Parses init string to a dictionary of settings: name -> value.
+	- commas inside single-quoted literals are not token delimiters
+	- class-options enclosed by round brackets e.g. "<groupName>=(<groupTokens>)" are added as separate keys with groupName_Key"""
+	tokens = {}
+	if not text:
+		return tokens
+	if "'" not in text and '(' not in text:
+		# Plain 'key=value' tokens, commas are always delimiters
+		for token in text.split(','):
+			_add_init_token(tokens, token, '')
+		return tokens
+	for token in _split_toplevel_commas(text, 0, len(text)):
+		ix = token.find('(')
+		if ix > 0:
+			group_name = _get_group_name(token[:ix])
+			group_end = _find_group_end(token, ix) if group_name else -1
+			if group_end > 0:
+				prefix = group_name.upper() + '_'
+				for group_token in _split_toplevel_commas(token, ix + 1, group_end):
+					_add_init_token(tokens, group_token, prefix)
+				continue
+		_add_init_token(tokens, token, '')
+	return tokens
+
+
+@lru_cache(maxsize=64)
+def _parse_init_string_cached(text: str) -> Tuple[Tuple[str, str], ...]:
+	"""Cached version of the _scan_init_string(). Returns immutable (key, value) pairs, callers make their own dictionary.
+	Applications typically open all the sessions with the same options strings."""
+	return tuple(_scan_init_string(text).items())
+
+
+def _split_slash_list(value: str) -> List[str]:
+	"""Splits the value with the delimiter '/' to the list of trimmed strings."""
+	if '/' not in value:
+		return [trim_str_response(value)]
+	return [trim_str_response(x) for x in value.split('/')]
+
+
+# Options set directly to an attribute: (option name, InstrumentSettings attribute name, converter of the option value)
+# The options with special parsing or with interdependencies are handled in the InstrumentSettings.apply_option_settings()
+_PLAIN_OPTIONS = tuple((name.upper(), attr_name, converter) for name, attr_name, converter in (
+	('WriteDelay', 'write_delay', Conv.str_to_int),
+	('ReadDelay', 'read_delay', Conv.str_to_int),
+	('AddTermCharToWriteBinBlock', 'add_term_char_to_write_bin_block', Conv.str_to_bool),
+	('OpenTimeout', 'open_timeout', Conv.str_to_int),
+	('ExclusiveLock', 'exclusive_lock', Conv.str_to_bool),
+	('VxiCapable', 'vxi_capable', Conv.str_to_bool),
+	('Encoding', 'encoding', str),
+	('OpcTimeout', 'opc_timeout', Conv.str_to_int),
+	('VisaTimeout', 'visa_timeout', Conv.str_to_int),
+	('OpcQueryAfterWrite', 'opc_query_after_write', Conv.str_to_bool),
+	('StbInErrorCheck', 'stb_in_error_check', Conv.str_to_bool),
+	('EachCmdAsQuery', 'each_cmd_as_query', Conv.str_to_bool),
+	('DisableOpcQuery', 'disable_opc_query', Conv.str_to_bool),
+	('LoggingName', 'logging_name', str),
+	('LoggingFormat', 'logging_format', str),
+	('LogToGlobalTarget', 'log_to_global_target', Conv.str_to_bool),
+	('LoggingToConsole', 'log_to_console', Conv.str_to_bool),
+	('LoggingToUdp', 'log_to_udp', Conv.str_to_bool),
+	('LoggingUdpPort', 'log_udp_port', Conv.str_to_int),
+	('CmdReset', 'cmd_reset', str),
+	('SkipStatusSystemSettings', 'skip_status_system_setting', Conv.str_to_bool),
+	('SkipClearStatus', 'skip_clear_status', Conv.str_to_bool),
+	# Instrument object settings
+	('QueryInstrumentStatus', 'instrument_status_check', Conv.str_to_bool),
+	# Core object settings
+	('Simulate', 'simulating', Conv.str_to_bool),
+	('SupportedInstrModels', 'supported_instr_models', _split_slash_list),
+	('SupportedIdnPatterns', 'supported_idn_patterns', _split_slash_list),
+))
+
+# Lower-case TerminationCharacter option values with their characters
+_TERM_CHAR_NAMES = {
+	'\\r': '\r', 'cr': '\r',
+	'\\n': '\n', 'lf': '\n',
+	'\\t': '\t', 'tab': '\t',
+	'\\0': '\0', 'null': '\0'}
+
+# Prefix of the DriverSetup=(...) group keys
+_DRIVERSETUP_PREFIX = 'DRIVERSETUP_'
+
+
 class InstrViClearMode(Flag):
 	"""Mode for executing viClear() method."""
 	disabled = 0x00
@@ -29,6 +176,7 @@ class WaitForOpcMode(Enum):
 	stb_poll_slow = 2
 	stb_poll_superslow = 3
 	opc_query = 4
+	service_request = 5
 
 
 class OpcSyncQueryMechanism(Enum):
@@ -39,6 +187,68 @@ class OpcSyncQueryMechanism(Enum):
 	only_check_mav_err_queue = 3  # Same as above, but skips the ClearBeforeRead()
 
 
+# Upper-case OpcWaitMode option values
+_OPC_WAIT_MODES = {
+	'STBPOLLING': WaitForOpcMode.stb_poll,
+	'STBPOLLINGSLOW': WaitForOpcMode.stb_poll_slow,
+	'STBPOLLINGSUPERSLOW': WaitForOpcMode.stb_poll_superslow,
+	'OPCQUERY': WaitForOpcMode.opc_query,
+	'SERVICEREQUEST': WaitForOpcMode.service_request}
+
+
+# Profile option values (lower-case) with the settings they override
+_PROFILES = {
+	'hm8123': {
+		'term_char': '\r',
+		'assure_write_with_tc': True,
+		'cmd_idn': 'IDN',
+		'cmd_reset': 'RST',
+		'skip_status_system_setting': True,
+		'skip_clear_status': True,
+		'disable_opc_query': True,
+		'instrument_status_check': False,
+		'stb_in_error_check': False},
+	'cmq': {
+		'term_char': '\r',
+		'assure_write_with_tc': True,
+		'skip_status_system_setting': True,
+		'skip_clear_status': True,
+		'disable_opc_query': True,
+		'instrument_status_check': False,
+		'stb_in_error_check': False,
+		'each_cmd_as_query': True},
+	'minimal': {
+		'assure_write_with_tc': True,
+		'skip_status_system_setting': True,
+		'skip_clear_status': True,
+		'disable_opc_query': True,
+		'instrument_status_check': False,
+		'stb_in_error_check': False},
+	'ats': {
+		'term_char': '\0',
+		'assure_write_with_tc': True,
+		'skip_status_system_setting': True,
+		'skip_clear_status': True,
+		'disable_opc_query': True,
+		'instrument_status_check': False,
+		'stb_in_error_check': False,
+		'each_cmd_as_query': True},
+	'xk41': {
+		'assure_write_with_tc': True,
+		'skip_status_system_setting': True,
+		'skip_clear_status': True,
+		'disable_opc_query': True,
+		'instrument_status_check': False,
+		'stb_in_error_check': False,
+		'each_cmd_prefix': '\n',
+		'first_cmds': '<q>M:REMOTE SENTER1',
+		'cmd_idn': 'M:GR GVER',
+		'idn_custom_parse': 'gVER"([^"]+)"->Rohde&Schwarz,M3SR,100000,\\1',
+		'term_char': '\r',
+		'each_cmd_as_query': True},
+}
+
+
 class InstrumentSettings(object):
 	"""Defines settings of the instrument session."""
 
@@ -65,6 +275,8 @@ class InstrumentSettings(object):
 		self.write_delay = write_delay
 		self.read_delay = read_delay
 		self.io_segment_size = io_segment_size
+		# True, if the io_segment_size was set by the options. Then it is not coerced by the interface type
+		self.io_segment_size_custom = False
 		self.opc_wait_mode = opc_wait_mode
 		self.opc_timeout = opc_timeout
 		self.visa_timeout = visa_timeout
@@ -106,6 +318,8 @@ class InstrumentSettings(object):
 
 		self.visa_select = None
 		self._last_settings = None
+		# The self._last_settings with the DriverSetup_ prefix removed, see the _get_driversetup_item()
+		self._driversetup_settings = None
 
 		# Instrument object settings
 		self.instrument_status_check = None
@@ -116,15 +330,19 @@ class InstrumentSettings(object):
 		self.supported_instr_models: List[str] = []
 		self.supported_idn_patterns: List[str] = []
 
+	def __copy__(self) -> 'InstrumentSettings':
+		"""Returns shallow copy of the settings. The list attributes are copied too, so they are not shared with the original."""
+		result = InstrumentSettings.__new__(InstrumentSettings)
+		result.__dict__.update(self.__dict__)
+		result.supported_instr_models = list(self.supported_instr_models)
+		result.supported_idn_patterns = list(self.supported_idn_patterns)
+		return result
+
 	def _get_driversetup_item(self, name: str) -> str:
 		"""Looks for a token that either has the name with prefix DRIVERSETUP_ or no prefix.
 		Example: Keynames DRIVERSETUP_WRITEDELAY and WRITEDELAY are equivalent.
 		If both keynames are present, the one with DRIVERSETUP_ has priority."""
-		name = name.upper()
-		value = self._last_settings.get(f'DRIVERSETUP_{name}')
-		if value is None:
-			value = self._last_settings.get(name)
-		return value
+		return self._driversetup_settings.get(name.upper())
 
 	def _get_item(self, name: str) -> str:
 		"""Returns a token value with the keyname name (case-insensitive) from the last settings dictionary.
@@ -132,98 +350,41 @@ class InstrumentSettings(object):
 		value = self._last_settings.get(name.upper())
 		return value
 
-	# noinspection PyMethodMayBeStatic
-	def _parse_init_settings_string(self, text: str) -> dict:
-		"""Parses init string to a dictionary of settings: name -> value."""
-		tokens = {}
-		if not text:
-			return tokens
-
-		# Text enclosed in single brackets '' must have the commas escaped
-		literal_pattern = r"'([^']+)'"
-		while True:
-			# literal loop
-			m = search(literal_pattern, text)
-			if not m:
-				break
-			lit_part = '"' + m.group(1).replace(',', '<COMMA_ESC>') + '"'
-			text = text.replace(m.group(0), lit_part)
-
-		# Remove all the class-options enclosed by round brackets e.g. "<groupName>=(<groupTokens>)"
-		group_pattern = r'(\w+)\s*=\s*\(([^\)]*)\)'
-		# Match class-settings, add them as separate keys with groupName_Key
-		while True:
-			# Group loop
-			m = search(group_pattern, text)
-			if not m:
-				break
-			text = text.replace(m.group(0), '')
-			group_name = m.group(1).upper()
-			group_tokens = m.group(2).strip().split(',')
-			for token in group_tokens:
-				key, value = parse_token_to_key_and_value(token)
-				if value:
-					tokens[f'{group_name}_{key.upper()}'] = value
-
-		# All groups are removed from the text, now we can use splitting on commas and remove white-space-only elements
-		for token in text.split(','):
-			key, value = parse_token_to_key_and_value(token.replace('<COMMA_ESC>', ','))
-			if value:
-				tokens[key.upper()] = value
-		return tokens
-
 	def apply_option_settings(self, text: str or None) -> None:
 		"""Takes options from the settings dictionary and applies them to the InstrumentSettings class properties."""
 		if not text:
 			return
 		if len(text) == 0:
 			return
-		self._last_settings = self._parse_init_settings_string(text)
+		items = _parse_init_string_cached(text.strip())
+		if not items:
+			# For example, only commas or white spaces
+			return
+		self._last_settings = dict(items)
+		# The DriverSetup items without the prefix, they have priority over the same items entered without the DriverSetup group
+		driversetup = {k: v for k, v in items if not k.startswith(_DRIVERSETUP_PREFIX)}
+		driversetup.update((k[len(_DRIVERSETUP_PREFIX):], v) for k, v in items if k.startswith(_DRIVERSETUP_PREFIX))
+		self._driversetup_settings = driversetup
 
 		value = self._get_item('SelectVisa')
 		if value:
 			self.visa_select = value
 
-		value = self._get_driversetup_item('WriteDelay')
-		if value:
-			self.write_delay = Conv.str_to_int(value)
-
-		value = self._get_driversetup_item('ReadDelay')
-		if value is not None:
-			self.read_delay = Conv.str_to_int(value)
+		for name, attr_name, converter in _PLAIN_OPTIONS:
+			value = driversetup.get(name)
+			if value:
+				setattr(self, attr_name, converter(value))
 
 		# OpcWaitMode
 		value = self._get_driversetup_item('OpcWaitMode')
 		if value:
 			value = value.upper()
-			if value == 'STBPOLLING':
-				self.opc_wait_mode = WaitForOpcMode.stb_poll
-			elif value == 'STBPOLLINGSLOW':
-				self.opc_wait_mode = WaitForOpcMode.stb_poll_slow
-			elif value == 'STBPOLLINGSUPERSLOW':
-				self.opc_wait_mode = WaitForOpcMode.stb_poll_superslow
-			elif value == 'OPCQUERY':
-				self.opc_wait_mode = WaitForOpcMode.opc_query
-			else:
+			enum_value = _OPC_WAIT_MODES.get(value)
+			if enum_value is None:
 				raise ValueError(
 					f"Unknown value in InitWithOptions string DriverSetup key 'WaitForOPC'. Value '{value}' is not recognized. "
-					"Valid values: 'StbPolling', 'StbPollingSlow', 'StbPollingSuperSlow', 'OpcQuery'")
-
-		value = self._get_driversetup_item('AddTermCharToWriteBinBlock')
-		if value:
-			self.add_term_char_to_write_bin_block = Conv.str_to_bool(value)
-
-		value = self._get_driversetup_item('OpenTimeout')
-		if value:
-			self.open_timeout = Conv.str_to_int(value)
-
-		value = self._get_driversetup_item('ExclusiveLock')
-		if value:
-			self.exclusive_lock = Conv.str_to_bool(value)
-
-		value = self._get_driversetup_item('VxiCapable')
-		if value:
-			self.vxi_capable = Conv.str_to_bool(value)
+					"Valid values: 'StbPolling', 'StbPollingSlow', 'StbPollingSuperSlow', 'OpcQuery', 'ServiceRequest'")
+			self.opc_wait_mode = enum_value
 
 		# ScpiQuotes
 		value = self._get_driversetup_item('ScpiQuotes')
@@ -248,36 +409,20 @@ class InstrumentSettings(object):
 			value = self._get_driversetup_item('DataChunkSize')
 		if value:
 			self.io_segment_size = Conv.str_to_int(value)
+			self.io_segment_size_custom = True
 
 		# TerminationCharacter
 		value = self._get_driversetup_item('TerminationCharacter')
 		if value:
 			val_lc = value.lower()
-			if value == '\\r' or val_lc == 'cr':
-				self.term_char = '\r'
-			elif value == '\\n' or val_lc == 'lf':
-				self.term_char = '\n'
-			elif value == '\\t' or val_lc == 'tab':
-				self.term_char = '\t'
-			elif value == '\\0' or val_lc == 'null':
-				self.term_char = '\0'
+			term_char = _TERM_CHAR_NAMES.get(val_lc)
+			if term_char is not None:
+				self.term_char = term_char
 			elif val_lc.startswith("0x") and len(val_lc) >= 4:
 				self.term_char = chr(int(value[2:], 16))
 			else:
 				self.term_char = value
 
-		value = self._get_driversetup_item('Encoding')
-		if value:
-			self.encoding = value
-
-		value = self._get_driversetup_item('OpcTimeout')
-		if value:
-			self.opc_timeout = Conv.str_to_int(value)
-
-		value = self._get_driversetup_item('VisaTimeout')
-		if value:
-			self.visa_timeout = Conv.str_to_int(value)
-
 		# ViClearExeMode
 		value = self._get_driversetup_item('ViClearExeMode')
 		if value:
@@ -307,22 +452,6 @@ class InstrumentSettings(object):
 						f"Valid values: Standard, AlsoCheckMav, ClsOnlyCheckMavErrQueue, OnlyCheckMavErrQueue.")
 			self.opc_query_sync_mechanism = enum_value
 
-		value = self._get_driversetup_item('OpcQueryAfterWrite')
-		if value:
-			self.opc_query_after_write = Conv.str_to_bool(value)
-
-		value = self._get_driversetup_item('StbInErrorCheck')
-		if value:
-			self.stb_in_error_check = Conv.str_to_bool(value)
-
-		value = self._get_driversetup_item('EachCmdAsQuery')
-		if value:
-			self.each_cmd_as_query = Conv.str_to_bool(value)
-
-		value = self._get_driversetup_item('DisableOpcQuery')
-		if value:
-			self.disable_opc_query = Conv.str_to_bool(value)
-
 		# LoggingMode
 		value = self._get_driversetup_item('LoggingMode')
 		if value:
@@ -333,48 +462,11 @@ class InstrumentSettings(object):
 					f"Valid values: {', '.join([x.name for x in LoggingMode])}")
 			self.logging_mode = enum_value
 
-		# Logging
-		value = self._get_driversetup_item('LoggingName')
-		if value:
-			self.logging_name = value
-
-		value = self._get_driversetup_item('LoggingFormat')
-		if value:
-			self.logging_format = value
-
-		value = self._get_driversetup_item('LogToGlobalTarget')
-		if value:
-			self.log_to_global_target = Conv.str_to_bool(value)
-
-		value = self._get_driversetup_item('LoggingToConsole')
-		if value:
-			self.log_to_console = Conv.str_to_bool(value)
-
-		value = self._get_driversetup_item('LoggingToUdp')
-		if value:
-			self.log_to_udp = Conv.str_to_bool(value)
-
-		value = self._get_driversetup_item('LoggingUdpPort')
-		if value:
-			self.log_udp_port = Conv.str_to_int(value)
-
 		# Others
 		value = self._get_driversetup_item('CmdIdn')
 		if value:
 			self.cmd_idn = '' if value.lower() == '<none>' else value
 
-		value = self._get_driversetup_item('CmdReset')
-		if value:
-			self.cmd_reset = value
-
-		value = self._get_driversetup_item('SkipStatusSystemSettings')
-		if value:
-			self.skip_status_system_setting = Conv.str_to_bool(value)
-
-		value = self._get_driversetup_item('SkipClearStatus')
-		if value:
-			self.skip_clear_status = Conv.str_to_bool(value)
-
 		# QueryOpt
 		value = self._get_driversetup_item('QueryOpt')
 		if value:
@@ -385,89 +477,21 @@ class InstrumentSettings(object):
 					f"Valid values: {', '.join([x.name for x in Opts.ParseMode])}")
 			self.instr_options_parse_mode = enum_value
 
-		# Instrument object settings
-		value = self._get_driversetup_item('QueryInstrumentStatus')
-		if value:
-			self.instrument_status_check = Conv.str_to_bool(value)
-
 		value = self._get_driversetup_item('SimulationIdnString')
 		if value:
 			# Use the '*' instead of the ',' in the value to avoid comma as token delimiter
 			self.instrument_simulation_idn_string = value.replace('*', ',')
 
-		# Core object settings
-		value = self._get_driversetup_item('Simulate')
-		if value:
-			self.simulating = Conv.str_to_bool(value)
-
-		value = self._get_driversetup_item('SupportedInstrModels')
-		if value:
-			self.supported_instr_models = [*map(trim_str_response, value.split('/'))]
-
-		value = self._get_driversetup_item('SupportedIdnPatterns')
-		if value:
-			self.supported_idn_patterns = [*map(trim_str_response, value.split('/'))]
-
 		# Profiles
 		value = self._get_driversetup_item('Profile')
 		if value:
 			val_low = value.lower()
 
-			if val_low == 'hm8123':
-				self.term_char = '\r'
-				self.assure_write_with_tc = True
-				self.cmd_idn = 'IDN'
-				self.cmd_reset = 'RST'
-				self.skip_status_system_setting = True
-				self.skip_clear_status = True
-				self.disable_opc_query = True
-				self.instrument_status_check = False
-				self.stb_in_error_check = False
-
-			elif val_low == 'cmq':
-				self.term_char = '\r'
-				self.assure_write_with_tc = True
-				self.skip_status_system_setting = True
-				self.skip_clear_status = True
-				self.disable_opc_query = True
-				self.instrument_status_check = False
-				self.stb_in_error_check = False
-				self.each_cmd_as_query = True
-
-			elif val_low == 'minimal':
-				self.assure_write_with_tc = True
-				self.skip_status_system_setting = True
-				self.skip_clear_status = True
-				self.disable_opc_query = True
-				self.instrument_status_check = False
-				self.stb_in_error_check = False
-
-			elif val_low == 'ats':
-				self.term_char = '\0'
-				self.assure_write_with_tc = True
-				self.skip_status_system_setting = True
-				self.skip_clear_status = True
-				self.disable_opc_query = True
-				self.instrument_status_check = False
-				self.stb_in_error_check = False
-				self.each_cmd_as_query = True
-
-			elif val_low == 'xk41':
-				self.assure_write_with_tc = True
-				self.skip_status_system_setting = True
-				self.skip_clear_status = True
-				self.disable_opc_query = True
-				self.instrument_status_check = False
-				self.stb_in_error_check = False
-				self.each_cmd_prefix = '\n'
-				self.first_cmds = '<q>M:REMOTE SENTER1'
-				self.cmd_idn = 'M:GR GVER'
-				self.idn_custom_parse = 'gVER"([^"]+)"->Rohde&Schwarz,M3SR,100000,\\1'
-				self.term_char = '\r'
-				self.each_cmd_as_query = True
-
-			else:
+			overrides = _PROFILES.get(val_low)
+			if overrides is None:
 				raise ValueError(f"Unknown value in InitWithOptions string 'options', key 'Profile', value '{value}'. Valid values (case-insensitive): HM8123, CMQ, Minimal, XK41, ATS")
+			for attr_name, attr_value in overrides.items():
+				setattr(self, attr_name, attr_value)
 
 			# Following values can still be overwritten on top of the profiles
 			value = self._get_driversetup_item('FirstCmds')
@@ -5,13 +5,15 @@ from datetime import datetime
 import re
 import string
 from typing import List, Dict
-from textwrap import wrap
 
 from .Utilities import get_plural_string, shorten_string_middle, escape_nonprintable_chars, size_to_kb_mb_string, calculate_chunks_count
 from .InstrumentErrors import RsInstrException
 from .Conversions import list_to_csv_str, convert_ts_to_datetime, get_timedelta_string, get_timestamp_string, get_timedelta_fixed_string
 from .GlobalData import GlobalData
 
+# Two-digit hex representation of each byte value, used by the hexdumps
+_HEX_BYTE = tuple(f'{x:02x}' for x in range(256))
+
 
 class LoggingMode(Enum):
     """Determines the format of the logging message."""
@@ -268,6 +270,8 @@ class ScpiLogger:
         self._default_mode: LoggingMode = LoggingMode.Off
         self._last_logging_mode: LoggingMode = LoggingMode.On
         self._mode: LoggingMode = self._default_mode
+        self.enabled: bool = self._mode != LoggingMode.Off
+        """Read-only, updated with the mode. True, if the logging mode is not Off. Callers can use it to skip composing of the log strings."""
         self._log_target_local = None
         self._cached = CachedEntries()
         self._timestamp_reference_time_local: datetime or None = None
@@ -278,6 +282,7 @@ class ScpiLogger:
         self._log_to_console = False
         self._log_to_udp = False
         self._udp_port = 49200
+        self._udp_address = ('127.0.0.1', self._udp_port)
 
         # Transients
         self._segment: Segment or None = None
@@ -445,6 +450,7 @@ class ScpiLogger:
             # logging is ON. Check the internal log entries and flush them to the target
             self._flush_cached_entries()
         self._mode = value
+        self.enabled = value != LoggingMode.Off
         if self._mode == LoggingMode.Off and self.get_logging_target():
             # Logging was switched off, flush the entries on the target
             self.flush()
@@ -524,6 +530,7 @@ class ScpiLogger:
     def udp_port(self, value: int) -> None:
         """Sets UDP logging port. Default value is 49200."""
         self._udp_port = value
+        self._udp_address = ('127.0.0.1', value)
 
     def set_relative_timestamp(self, timestamp: datetime) -> None:
         """If set, the further timestamps will be relative to the entered time."""
@@ -609,12 +616,12 @@ class ScpiLogger:
 
     def _send_to_udp(self, content: str, error: bool):
         """Sends the log string to the defined udp port. Any socket exception is consumed."""
-        prefix = '[e]' if error else '[i]'
-        msg = bytes(prefix + content, "utf-8")
+        # One datagram per entry: the receiver distinguishes the entries by the datagram boundaries and the [i] / [e] prefix
+        msg = (('[e]' if error else '[i]') + content).encode('utf-8')
         try:
             if self._socket is None:
                 self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self._socket.sendto(msg, ("127.0.0.1", self._udp_port))
+            self._socket.sendto(msg, self._udp_address)
         finally:
             return
 
@@ -641,9 +648,16 @@ class ScpiLogger:
                 return
         self._write_to_log(log_entry)
 
+    def _info_accepted(self) -> bool:
+        """Returns True, if an info entry would be logged at all. Used to skip composing the entries that would be dropped."""
+        if self._mode == LoggingMode.Off:
+            return False
+        # In the errors logging mode, the info entries outside a segment are dropped
+        return self._mode != LoggingMode.Errors or bool(self._segment)
+
     def info(self, start_time: datetime or float or None, end_time: datetime or float or None, log_string_info: str, log_string: str, cmd: str or None = None) -> None:
         """Method for logging one info entry. For binary log_string, use the info_bin()"""
-        if self.mode == LoggingMode.Off:
+        if not self._info_accepted():
             return
         entry = self._compose_log_entry(start_time, end_time, log_string_info, log_string, cmd, self.abbreviated_max_len_ascii)
         entry.add_new_line = True
@@ -651,7 +665,7 @@ class ScpiLogger:
 
     def info_bin(self, start_time: datetime or float or None, end_time: datetime or float or None, log_string_info: str, log_data: bytes, cmd: str or None = None) -> None:
         """Method for logging one info entry where the log_data is binary (bytes)."""
-        if self.mode == LoggingMode.Off:
+        if not self._info_accepted():
             return
         entry = self._compose_bin_log_entry(start_time, end_time, log_string_info, cmd, log_data)
         entry.add_new_line = True
@@ -659,7 +673,7 @@ class ScpiLogger:
 
     def info_list(self, start_time: datetime or float or None, end_time: datetime or float or None, log_string_info: str, list_data: List, cmd: str or None = None) -> None:
         """Method for logging one info entry where the list_data is decimal List[]."""
-        if self.mode == LoggingMode.Off:
+        if not self._info_accepted():
             return
         delimiter = ', '
         if len(list_data) <= self.abbreviated_max_len_list:
@@ -740,11 +754,13 @@ class ScpiLogger:
         entry = LogEntry(start_time, end_time, self.device_name, log_string_info, log_string, cmd, add_new_line=False, error=False, raw=False, binary=True)
         return entry
 
-    def _compose_hexdump(self, value: str or bytes, offset_left: int) -> str:
+    def _compose_hexdump(self, value: str or bytes or bytearray or memoryview, offset_left: int) -> str:
         """Composes hexdump string from string or bytes.
         The hex dump is organised in the groups of 16 bytes per line."""
         if isinstance(value, str):
             value = bytes(value, self.encoding)
+        # Only the shown lines are sliced, the memoryview slices do not copy the data
+        value = memoryview(value)
         size = len(value)
         line = f'{size_to_kb_mb_string(size, True)}'
         padding = ' ' * offset_left
@@ -778,7 +794,7 @@ class ScpiLogger:
                 end = size
             chunk = value[ix: end]
             cp = [chr(c) if c in self._printable_chars else '.' for c in chunk]
-            line += padding + ' '.join(wrap(chunk.hex(), 2)).ljust(right_padding) + '    ' + ''.join(cp) + self._line_divider
+            line += padding + ' '.join(map(_HEX_BYTE.__getitem__, chunk)).ljust(right_padding) + '    ' + ''.join(cp) + self._line_divider
             ix += self.bin_line_block_size
         return line
 
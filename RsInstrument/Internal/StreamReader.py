@@ -7,6 +7,9 @@ from typing import AnyStr
 from .Utilities import size_to_kb_mb_string
 from .InstrumentErrors import RsInstrException
 
+# Buffer size of the files, so reading small chunks does not cause one system call each
+_FILE_BUFFER_SIZE = 512 * 1024
+
 
 class Type(Enum):
 	"""Defines type of the stream - variable or file."""
@@ -43,7 +46,7 @@ class StreamReader:
 			if not path.isfile(data):
 				raise RsInstrException(f'File does not exist. File path: {data}')
 			self.file_path = data
-			self._data = open(self.file_path, 'rb' if self._binary else 'r')
+			self._data = open(self.file_path, 'rb' if self._binary else 'r', buffering=_FILE_BUFFER_SIZE)
 			self._full_len = path.getsize(self.file_path)
 		else:
 			raise RsInstrException(f'StreamReader unknown type {source}')
@@ -1,12 +1,15 @@
 """See the docstring for the StreamWriter class."""
 
 from enum import Flag
-from typing import AnyStr
-from io import BytesIO, StringIO
+from typing import AnyStr, Callable
+from io import StringIO
 
 from .Utilities import size_to_kb_mb_string
 from .InstrumentErrors import RsInstrException
 
+# Buffer size of the files, so the small data chunks do not cause one system call each
+_FILE_BUFFER_SIZE = 512 * 1024
+
 
 class Type(Flag):
 	"""Defines type of the stream - variable or file."""
@@ -14,13 +17,15 @@ class Type(Flag):
 	Forget = 2
 	File = 4
 	FileAppend = 12
+	Handler = 16
 
 
 class StreamWriter:
 	"""Lightweight stream writer implementation. Data target can be: \n
 	- bytes
 	- string
-	- file"""
+	- file
+	- handler function, called with each chunk"""
 
 	def __init__(self, binary: bool, target: Type, meta_data=None):
 		"""Initializes StreamWriter instance.\n
@@ -28,14 +33,20 @@ class StreamWriter:
 		:param target: Target for the stream. Variable / File (FileAppend)
 		:param meta_data: Only valid for File and FileAppend - define file path as string:
 		For Type.File, data must be string with file path. If the file exists, it will be overwritten.
-		For Type.FileAppend, data must be string with file path. If the file exists, it will be appended."""
+		For Type.FileAppend, data must be string with file path. If the file exists, it will be appended.
+		For Type.Handler, data must be the handler function, it is called with each written chunk."""
 		self._binary: bool = binary
 		self._written_len: int = 0
 		self._target = target
+		# Evaluated once, the write() is called for every received chunk
+		self._forget: bool = Type.Forget in target
+		# Binary variables collect the chunks in a list, see the content property
+		self._bin_chunks: bool = binary and Type.Variable in target
+		self._handler: bool = Type.Handler in target
 
 		if Type.Variable in self._target:
 			assert meta_data is None, f'You can not define input meta_data for a Variable StreamWriter.'
-			self._data = BytesIO() if binary else StringIO()
+			self._data = [] if binary else StringIO()
 		elif Type.Forget in self._target:
 			self._data: AnyStr = ''
 		elif Type.File in self._target:
@@ -43,7 +54,10 @@ class StreamWriter:
 			self._file_path = meta_data
 			mode = 'w' if self._target == Type.File else 'a'
 			mode += 'b' if self._binary else ''
-			self._data = open(self._file_path, mode)
+			self._data = open(self._file_path, mode, buffering=_FILE_BUFFER_SIZE)
+		elif Type.Handler in self._target:
+			assert callable(meta_data), f'Additional data must be a handler function. Actual type: {type(meta_data)}'
+			self._data = meta_data
 		else:
 			raise RsInstrException(f'StreamWriter unknown target {target}')
 
@@ -76,6 +90,12 @@ class StreamWriter:
 		:param append: Optional [bool] If True, the content is appended to the existing content."""
 		return cls(False, Type.FileAppend if append else Type.File, file_path)
 
+	@classmethod
+	def as_bin_handler(cls, handler: Callable) -> 'StreamWriter':
+		"""Creates new StreamWriter which sends each binary data chunk to the handler.
+		:param handler: [Callable] Handler prototype: handler(chunk: bytes)"""
+		return cls(True, Type.Handler, handler)
+
 	def __str__(self):
 		if Type.Variable in self._target:
 			mode = 'binary' if self._binary else 'string'
@@ -86,6 +106,8 @@ class StreamWriter:
 			return f'StreamWriter {mode} file{append}, current{append} size {size_to_kb_mb_string(len(self), True)}, file: {self._file_path}'
 		if Type.Forget in self._target:
 			return 'StreamWriter to nowhere.'
+		if Type.Handler in self._target:
+			return f'StreamWriter to handler, current size {size_to_kb_mb_string(len(self), True)}'
 
 	def __len__(self):
 		"""Returns remaining length."""
@@ -107,8 +129,9 @@ class StreamWriter:
 		"""Writes chunk to the stream.
 			- For Type.Bytes data must be bytes.
 			- For Type.String, data must be string.
-			- For Type.File and Type.FileAppend, data must be bytes."""
-		if Type.Forget in self._target:
+			- For Type.File and Type.FileAppend, data must be bytes.
+			- For Type.Handler, data must be bytes."""
+		if self._forget:
 			self._written_len += len(data)
 			return
 
@@ -117,9 +140,11 @@ class StreamWriter:
 			assert isinstance(data, bytes), f'Bytes data is required. Actual type: {type(data)}. {self}'
 		else:
 			assert isinstance(data, str), f'String data is required. Actual type: {type(data)}. {self}'
-		if Type.Variable in self._target:
-			self._data.write(data)
-		elif Type.File in self._target:
+		if self._bin_chunks:
+			self._data.append(data)
+		elif self._handler:
+			self._data(data)
+		else:
 			self._data.write(data)
 		self._written_len += len(data)
 
@@ -132,6 +157,7 @@ class StreamWriter:
 		self._binary = False
 		if Type.Variable in self._target:
 			self._data = StringIO(self.content.decode(encoding))
+			self._bin_chunks = False
 		elif Type.File in self._target:
 			self._data.close()
 			self._data = open(self._file_path, 'a')
@@ -145,8 +171,11 @@ class StreamWriter:
 		if self._target != Type.Variable:
 			raise RsInstrException(f'Can not return content for the current {self}')
 		# noinspection PyTypeChecker
-		if not self._data:
+		if self._data is None:
 			return None
+		if self._bin_chunks:
+			# Joined with one copy of exactly the needed size, a single chunk is returned as it is
+			return b''.join(self._data)
 		self._data.seek(0)
 		ret_val = self._data.read()
 		self._data.close()
@@ -101,19 +101,17 @@ def parse_token_to_key_and_value(token: str) -> Tuple[str, str]:
 	If the token is empty: name = None, value = None.
 	If the '=' is not found: name = token, value = None.
 	name is trimmed for white spaces.
-	value is trimmed with trim_str_response()."""
+	value is everything after the first '=', trimmed with trim_str_response()."""
 	token = token.strip()
 	if not token:
 		# noinspection PyTypeChecker
 		return None, None
-	if '=' in token:
-		data = token.split('=')
-		name = data[0].strip()
-		value = trim_str_response(data[1])
-		return name, value
+	name, delimiter, value = token.partition('=')
+	if delimiter:
+		return name.strip(), trim_str_response(value)
 
 	# noinspection PyTypeChecker
-	return token.strip(), None
+	return token, None
 
 
 def size_to_kb_mb_gb_string(data_size: int, as_additional_info: bool = False, allow_gb: bool = True) -> str:
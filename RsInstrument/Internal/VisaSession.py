@@ -32,6 +32,14 @@ class SessionKind(Enum):
 	rs_nrp = 7
 
 
+# Caps of the default data chunk size for the interfaces that do not profit from the large chunks.
+# USB: larger transfers are fragmented to the URBs anyway. Serial: the transfer rate is the bottleneck.
+_DEFAULT_DATA_CHUNK_SIZE_CAPS = {
+	SessionKind.usb: 256 * 1024,
+	SessionKind.serial: 4096
+}
+
+
 class ReadDataType(Enum):
 	"""Data type returned by the instrument."""
 	unknown = 0
@@ -141,6 +149,7 @@ class VisaSession(object):
 			self._interface_type = SessionKind.serial
 
 		elif self._session.interface_type == pyvisa.constants.InterfaceType.usb:
+			self._interface_type = SessionKind.usb
 			# Check whether it is not the NRP-Z
 			intf_type = self._session.get_visa_attribute(pyvisa.constants.VI_ATTR_INTF_TYPE)
 			if intf_type == pyvisa.constants.InterfaceType.rsnrp:
@@ -174,6 +183,8 @@ class VisaSession(object):
 		self.read_delay = settings.read_delay
 		self._viclear_exe_mode = settings.viclear_exe_mode
 		self._opc_wait_mode = settings.opc_wait_mode
+		# Last *SRE mask set for the service request wait, see the _set_srq_sre_mask()
+		self._srq_sre_mask = StatusByte.NONE
 
 		# Parameters that need to be coerced based on Vxi-capability
 		if self.vxi_capable:
@@ -187,8 +198,11 @@ class VisaSession(object):
 		# Changeable settings
 		self.opc_timeout = 10000 if settings.opc_timeout == 0 else settings.opc_timeout
 		self.visa_timeout = settings.visa_timeout
-		self._session.chunk_size = settings.io_segment_size
-		self._data_chunk_size = settings.io_segment_size
+		chunk_size = settings.io_segment_size
+		if not settings.io_segment_size_custom and self._interface_type in _DEFAULT_DATA_CHUNK_SIZE_CAPS:
+			chunk_size = min(chunk_size, _DEFAULT_DATA_CHUNK_SIZE_CAPS[self._interface_type])
+		self._session.chunk_size = chunk_size
+		self._data_chunk_size = chunk_size
 
 		# Must call the VISA viClear() before any communication with the instrument
 		self.clear()
@@ -359,13 +373,32 @@ class VisaSession(object):
 		"""Based on the WaitForOpcMode, it sets the ESE and SRE register masks.
 		Returns coerced WaitForOpcMode."""
 		# Set the SRE and ESE registers accordingly
-		# No SRE is supported
 		if self.skip_status_system_setting:
-			return mode
+			# The service request wait relies on the SRE register set here
+			return WaitForOpcMode.stb_poll if mode == WaitForOpcMode.service_request else mode
 		self._set_ese_mask(EventStatusRegister.operation_complete)
+		if mode == WaitForOpcMode.service_request:
+			if self.vxi_capable:
+				try:
+					self._session.enable_event(pyvisa.constants.EventType.service_request, pyvisa.constants.EventMechanism.queue)
+					self._set_srq_sre_mask(StatusByte.event_status_byte | StatusByte.error_queue_not_empty, True)
+					return mode
+				except pyvisa.VisaIOError:
+					pass
+			# The session can not receive service requests, use the STB polling instead
+			mode = WaitForOpcMode.stb_poll
 		self._set_sre_mask(StatusByte.NONE)
+		self._srq_sre_mask = StatusByte.NONE
 		return mode
 
+	def _set_srq_sre_mask(self, mask: StatusByte, force: bool = False) -> None:
+		"""Sets the *SRE mask for the service request wait, only if it differs from the last one.
+		The service request is only generated when the masked STB changes from zero to non-zero,
+		therefore the mask must contain only the bits the wait ends on."""
+		if force or mask != self._srq_sre_mask:
+			self._set_sre_mask(mask)
+			self._srq_sre_mask = mask
+
 	# noinspection PyTypeChecker
 	def _set_ese_mask(self, mask: EventStatusRegister, reset: bool = True) -> None:
 		"""Sends *ESE command with mask parameter."""
@@ -392,29 +425,37 @@ class VisaSession(object):
 		Returns the last read Status Byte value."""
 		timeout_secs = timeout / 1000
 		end_mask = StatusByte.error_queue_not_empty | StatusByte.event_status_byte
+		if is_query is True:
+			if self.opc_sync_query_mechanism == OpcSyncQueryMechanism.also_check_mav:
+				end_mask |= StatusByte.message_available
+			elif self.opc_sync_query_mechanism == OpcSyncQueryMechanism.only_check_mav_err_queue or self.opc_sync_query_mechanism == OpcSyncQueryMechanism.cls_only_check_mav_err_queue:
+				end_mask = StatusByte.error_queue_not_empty | StatusByte.message_available
 		if command.endswith(self._term_char):
 			command = command.rstrip(self._term_char)
+		srq_wait = self._opc_wait_mode == WaitForOpcMode.service_request
+		if srq_wait:
+			self._set_srq_sre_mask(end_mask)
+			# Drop the service requests left over from the previous operations
+			self._session.discard_events(pyvisa.constants.EventType.service_request, pyvisa.constants.EventMechanism.queue)
 
 		if is_query is True:
 			if self.opc_sync_query_mechanism == OpcSyncQueryMechanism.standard or self.opc_sync_query_mechanism == OpcSyncQueryMechanism.also_check_mav:
 				self.clear_before_read()
 				self.write(command + ';*OPC')
-				if self.opc_sync_query_mechanism == OpcSyncQueryMechanism.also_check_mav:
-					end_mask |= StatusByte.message_available
 
 			elif self.opc_sync_query_mechanism == OpcSyncQueryMechanism.only_check_mav_err_queue:
 				self.write(command)
-				end_mask = StatusByte.error_queue_not_empty | StatusByte.message_available
 
 			elif self.opc_sync_query_mechanism == OpcSyncQueryMechanism.cls_only_check_mav_err_queue:
 				self.clear_before_read()
 				self.write(command)
-				end_mask = StatusByte.error_queue_not_empty | StatusByte.message_available
 		else:
 			self.clear_before_read()
 			self.write(command + ';*OPC')
 
 		start = time.time()
+		if srq_wait:
+			return self._wait_for_srq_stb(command, is_query, timeout, end_mask, start)
 		# STB polling loop
 		while True:
 			stb = self._read_stb()
@@ -425,6 +466,22 @@ class VisaSession(object):
 				break
 		return stb
 
+	def _wait_for_srq_stb(self, command: str, is_query: bool, timeout: int, end_mask: StatusByte, start: float) -> StatusByte:
+		"""Waits for the service requests instead of polling the Status Byte, ends if the STB fits the end_mask.
+		The service request only wakes up the wait, the end condition is the same as for the STB polling.
+		The STB is read before each wait, because no new service request comes if the masked STB is already non-zero.
+		Returns the last read Status Byte value."""
+		while True:
+			stb = self._read_stb()
+			if end_mask & stb:
+				return stb
+			left_ms = int(timeout - (time.time() - start) * 1000)
+			if left_ms <= 0:
+				self._narrow_down_opc_tout_error(command, is_query, timeout)
+			response = self._session.wait_on_event(pyvisa.constants.EventType.service_request, left_ms, capture_timeout=True)
+			if response.timed_out:
+				self._narrow_down_opc_tout_error(command, is_query, timeout)
+
 	def _write_and_poll_stb_non_vxi(self, command: str, timeout: int) -> StatusByte:
 		"""Queries Status Byte Register (*STB?) and ends if the ESB bit (5) is set to 1.
 			The command must not be a query. Also works with the SOCKET and SERIAL interface.
@@ -1017,7 +1074,7 @@ class VisaSession(object):
 
 	def reset_ese_sre(self) -> None:
 		"""Resets the status of ESE and SRE registers to default values."""
-		self._set_regs_ese_sre(self._opc_wait_mode)
+		self._opc_wait_mode = self._set_regs_ese_sre(self._opc_wait_mode)
 
 	def write_bin_block(self, cmd: str, data_stream: StreamReader) -> None:
 		"""Writes all the payload as binary data block to the instrument.
@@ -1,7 +1,7 @@
 """Root class for remote-controlling instrument with SCPI commands."""
 
 import threading
-from typing import List, Tuple, ClassVar
+from typing import List, Tuple, ClassVar, Callable
 from datetime import datetime, timedelta
 
 from .Fixed_Files.Events import Events
@@ -13,7 +13,7 @@ from .Internal.VisaSession import VisaSession
 from .Internal.ScpiLogger import ScpiLogger
 from .Internal.Utilities import trim_str_response
 from .Internal.GlobalData import GlobalData
-from .Internal.ContextManagers import InstrErrorSuppressor, VisaTimeoutSuppressor
+from .Internal.ContextManagers import InstrErrorSuppressor, VisaTimeoutSuppressor, WriteBatch
 
 
 class RsInstrument:
@@ -46,12 +46,12 @@ class RsInstrument:
 			- ``TerminationCharacter = "\\r"`` - sets the termination character for reading. Default: ``\\n`` (LineFeed or LF)
 			- ``AssureWriteWithTermChar = True`` - makes sure each command/query is terminated with termination character. Default: Interface dependent
 			- ``AddTermCharToWriteBinBlock = True`` - adds one additional LF to the end of the binary data (some instruments require that). Default: ``False``
-			- ``DataChunkSize = 10E3`` - maximum size of one write/read segment. If transferred data is bigger, it is split to more segments. Default: ``1E7`` bytes
+			- ``DataChunkSize = 10E3`` - maximum size of one write/read segment. If transferred data is bigger, it is split to more segments. Default: interface-dependent, ``1MiB`` for LAN and GPIB
 			- ``OpcTimeout = 10000`` - same as driver.utilities.opc_timeout = 10000. Default: ``30000ms``
 			- ``VisaTimeout = 5000`` - same as driver.utilities.visa_timeout = 5000. Default: ``10000ms``
 			- ``ViClearExeMode = Disabled`` - viClear() execution mode. Default: ``execute_on_all``
 			- ``OpcQueryAfterWrite = True`` - same as driver.utilities.opc_query_after_write = True. Default: ``False``
-			- ``OpcWaitMode = OpcQuery`` - mode for all the opc-synchronised write/reads. Other modes: StbPolling, StbPollingSlow, StbPollingSuperSlow. Default: ``StbPolling``
+			- ``OpcWaitMode = OpcQuery`` - mode for all the opc-synchronised write/reads. Other modes: StbPolling, StbPollingSlow, StbPollingSuperSlow, ServiceRequest. Default: ``StbPolling``
 			- ``StbInErrorCheck = False`` - if true, the driver checks errors with *STB? If false, it uses SYST:ERR?. Default: ``True``
 			- ``SkipStatusSystemSettings = False`` - some instruments do not support full status system commands. In such case, set this value to True. Default: ``False``
 			- ``SkipClearStatus = True`` - set to True for instruments that do not support *CLS command. Default: ``False``
@@ -364,7 +364,12 @@ class RsInstrument:
 
 	@data_chunk_size.setter
 	def data_chunk_size(self, chunk_size: int) -> None:
-		"""Sets the maximum size of one block transferred during write/read operations."""
+		"""Sets the maximum size of one block transferred during write/read operations.
+		Larger chunks mean fewer VISA calls for big data transfers. For slow links, smaller chunks keep the single reads short.
+		\nDefault values, unless set by the option 'DataChunkSize':
+		- LAN (VXI-11, HiSLIP, SOCKET), GPIB: 1 MiB
+		- USB: 256 kiB
+		- Serial: 4 kiB"""
 		self._core.io.data_chunk_size = chunk_size
 
 	@property
@@ -413,6 +418,11 @@ class RsInstrument:
 		This method is an alias to write() method."""
 		self._core.io.write(cmd, log_info='Write')
 
+	def write_many(self, cmds: List[str]) -> None:
+		"""Writes the commands to the instrument one after another, holding the session lock for all of them.
+		Unlike calling write() for each command, the instrument status is only checked once, after the last command."""
+		self._core.io.write_many(cmds, log_info='Write')
+
 	def write_int(self, cmd: str, param: int) -> None:
 		"""Writes the command to the instrument followed by the integer parameter:
 		e.g.: cmd = 'SELECT:INPUT' param = '2', result command = 'SELECT:INPUT 2'"""
@@ -622,6 +632,13 @@ class RsInstrument:
 		Throws an exception if the returned data was not a binary data."""
 		self._core.io.query_bin_block_to_file_with_opc(query, file_path, append, timeout)
 
+	def query_bin_float_list_in_chunks(self, query: str, handler: Callable, chunk_samples: int = 65536) -> None:
+		"""Queries binary data block of float numbers and sends them to the handler in lists of chunk_samples numbers, as the data arrive.
+		The last list can be shorter. Use it for very large traces: unlike the query_bin_or_ascii_float_list(), the whole response is never held in memory.
+		The numbers are decoded with the current bin_float_numbers_format.
+		Handler prototype: handler(numbers: List[float])"""
+		self._core.io.query_bin_float_list_in_chunks(query, handler, chunk_samples)
+
 	def write_bin_block_from_file(self, cmd: str, file_path: str) -> None:
 		"""Writes data from the file as binary data block to the instrument using the provided command.
 		Example for transferring a file from PC -> Instrument:
@@ -733,6 +750,13 @@ class RsInstrument:
 		"""
 		return VisaTimeoutSuppressor(self._core.io, visa_tout_ms)
 
+	def write_batch(self, max_size: int = 16384) -> WriteBatch:
+		"""Returns Context Manager that collects the set commands entered with its write() method.
+		On leaving the context, the commands are sent joined with ';' to compound commands of maximum max_size characters,
+		and the instrument status is checked only once. Use it for long sequences of short set commands.
+		:param max_size: Maximum length of one compound command. Default value: 16384 characters."""
+		return WriteBatch(self._core.io, max_size)
+
 	@property
 	def instrument_options(self) -> List[str]:
 		"""Returns all the instrument options.
@@ -35,6 +35,7 @@ setup(
                  'Programming Language :: Python :: 3.12'
                  ],
     packages=(find_packages(include=['RsInstrument', 'RsInstrument.*'])),
+    package_data={'RsInstrument': ['CHANGES.md']},
     install_requires=['PyVisa>=1.13.0'],
     python_requires='>=3.7'
 )